@@ -0,0 +1,52 @@
+# Benchmark dos backends de previsão ("keras", "numpy" e "ridge"):
+# tempo total (importações + treino + previsão), pico de memória e MSE de teste.
+#
+# Cada backend roda em um processo Python novo, sem o cache de modelos, para que
+# tempo e memória incluam a inicialização da biblioteca.
+#
+# Uso (a partir da raiz do projeto):
+#   python benchmarks/bench_backends.py
+
+import os
+import sys
+import json
+import subprocess
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ['keras', 'numpy', 'ridge']
+REPEAT = 3
+
+# Código executado no processo filho: sobrescreve a configuração antes de importar os módulos
+CHILD = """
+import sys, time, json, resource
+import config
+config.DEBUG_LEVEL = 0
+config.PLOT = False
+config.MODEL_CACHE = False
+from user_data_lib import prepare_combined_data, train_and_predict
+combined_data = prepare_combined_data()
+start = time.perf_counter()
+result = train_and_predict(combined_data, config.split_year, config.epochs, config.batch_size, backend={backend!r})
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+peak = peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+print(json.dumps({{'time': elapsed, 'train_time': result['train_time'], 'peak_memory_mb': peak, 'test_mse': result['test_mse']}}))
+"""
+
+def measure(backend):
+    runs = []
+    for _ in range(REPEAT):
+        output = subprocess.run([sys.executable, '-c', CHILD.format(backend=backend)], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return runs
+
+if __name__ == "__main__":
+    print(f"{'backend':>8} {'total (s)':>10} {'treino (s)':>11} {'memória (MB)':>13} {'MSE teste':>10}")
+    for backend in BACKENDS:
+        runs = measure(backend)
+        print(f"{backend:>8} {statistics.median(run['time'] for run in runs):>10.2f}"
+              f" {statistics.median(run['train_time'] for run in runs):>11.2f}"
+              f" {statistics.median(run['peak_memory_mb'] for run in runs):>13.0f}"
+              f" {statistics.median(run['test_mse'] for run in runs):>10.4f}")
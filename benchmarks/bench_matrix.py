@@ -0,0 +1,55 @@
+# Benchmark da matriz estação x mês (MetroMatrix) contra o DataFrame no formato longo:
+# consulta de cada estação (máscara booleana x fatia da matriz) e totais anuais por estação
+# (groupby + unstack x soma por blocos de meses), com dados sintéticos.
+#
+# Uso (a partir da raiz do projeto):
+#   python benchmarks/bench_matrix.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from synthetic_metro import generate_metro
+from user_load_lib import METRO_DTYPES
+from user_data_lib import fix_subway_line
+from user_matrix_lib import MetroMatrix
+
+STATION_COUNTS = [50, 500, 2000]
+LOOKUPS = 200
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def lookups_frame(metro_data, names):
+    return [metro_data.loc[metro_data['Station'] == name, ['year_month', 'passengers']] for name in names]
+
+def lookups_matrix(matrix, names):
+    return [matrix.station(name) for name in names]
+
+def yearly_frame(metro_data):
+    yearly = metro_data['passengers'].astype('float64').groupby([metro_data['Station'], metro_data['year']], observed=True).sum()
+    return yearly.unstack('year')
+
+if __name__ == "__main__":
+    print(f"{'estações':>9} {'linhas':>10} {'montagem (s)':>13} {'consultas DF (s)':>17} {'consultas matriz (s)':>21}"
+          f" {'anual DF (s)':>13} {'anual matriz (s)':>17}")
+    for n_stations in STATION_COUNTS:
+        data = generate_metro(n_stations).astype(METRO_DTYPES)
+        data['year_month'] = data['year_month'].astype('datetime64[ns]')
+        data = fix_subway_line(data)
+        names = np.random.default_rng(0).choice(data['Station'].cat.categories, LOOKUPS)
+
+        matrix, build_time = timed(MetroMatrix.from_frame, data)
+        _, frame_lookup = timed(lookups_frame, data, names)
+        _, matrix_lookup = timed(lookups_matrix, matrix, names)
+        expected, frame_yearly = timed(yearly_frame, data)
+        result, matrix_yearly = timed(MetroMatrix.yearly_by_station, matrix)
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+        print(f"{n_stations:>9} {len(data):>10} {build_time:>13.3f} {frame_lookup:>17.3f} {matrix_lookup:>21.3f}"
+              f" {frame_yearly:>13.3f} {matrix_yearly:>17.3f}")
@@ -0,0 +1,194 @@
+# Benchmark das etapas do processamento com dados sintéticos em escala crescente
+# (gerados por synthetic_metro.py): tempo, vazão (linhas/s) e memória de cada etapa
+# para cada número de estações.
+#
+# O tempo é medido em uma execução sem tracemalloc; a memória, em uma segunda execução
+# com tracemalloc (que deixa o código mais lento). Os resultados podem ser gravados em
+# JSON, junto com o commit e as versões das bibliotecas, e comparados entre commits.
+#
+# Uso (a partir da raiz do projeto):
+#   python benchmarks/bench_pipeline.py --stations 100 1000 10000 --output base.json
+#   python benchmarks/bench_pipeline.py --stations 100 1000 10000 --compare base.json
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import datetime
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Sobrescrever a configuração antes de importar os módulos: sem saída de depuração,
+# sem cache (cada leitura é medida de verdade) e com a previsão por estação habilitada
+import config
+config.DEBUG_LEVEL = 0
+config.PLOT = False
+config.CACHE = False
+config.INSTRUMENT = False
+config.PREDICTION = True
+config.STATION_PREDICTION = True
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+from synthetic_metro import write_metro
+from user_instrument_lib import measure
+from user_load_lib import parse_metro, load_population, load_pib
+from user_data_lib import (fix_subway_line, missing_report, remove_leading_nan, interpolate_population,
+                           unify_pib, combine_data, station_prediction)
+from user_graph_lib import boxplot_pages, draw_boxplot
+from user_matrix_lib import MetroMatrix
+
+# Acima deste número de estações o boxplot (um gráfico por estação) não é medido
+BOXPLOT_MAX_STATIONS = 50
+
+def stage_functions(path, epochs):
+    """
+    Etapas medidas, na ordem do processamento; cada uma recebe o resultado da anterior
+    (a leitura recebe o caminho do arquivo).
+    """
+    population_data = interpolate_population(load_population())
+    pib = unify_pib(load_pib())
+
+    def boxplot(metro_data):
+        import matplotlib.pyplot as plt
+        if metro_data['Station'].nunique() > BOXPLOT_MAX_STATIONS:
+            return None
+        for page in boxplot_pages(metro_data, 'year', 'passengers', 'Station'):
+            plt.close(draw_boxplot(*page, 4, "", "Pax / Mês", "Boxplot"))
+        return metro_data
+
+    return [
+        ('parse_metro', lambda _: parse_metro(path)),
+        ('fix_subway_line', fix_subway_line),
+        ('missing_report', lambda metro_data: (missing_report(metro_data), metro_data)[1]),
+        ('remove_leading_nan', remove_leading_nan),
+        ('combine_data', lambda metro_data: (combine_data(metro_data, population_data, pib), metro_data)[1]),
+        ('boxplot', boxplot),
+        ('metro_matrix', lambda metro_data: (MetroMatrix.from_frame(metro_data), metro_data)[1]),
+        ('station_prediction', lambda metro_data: station_prediction(MetroMatrix.from_frame(metro_data), config.split_year, epochs, config.batch_size)),
+    ]
+
+def run_stages(path, epochs, selected, memory):
+    """
+    Executa as etapas em sequência sobre o arquivo 'path' e retorna as medições de cada uma.
+    """
+    results = []
+    data = path
+    for name, function in stage_functions(path, epochs):
+        rows = len(data) if isinstance(data, pd.DataFrame) else None
+        if memory:
+            with measure(rows) as record:
+                output = function(data)
+        else:
+            record = {'rows_in': rows}
+            start, cpu = time.perf_counter(), time.process_time()
+            output = function(data)
+            record.update(wall=time.perf_counter() - start, cpu=time.process_time() - cpu)
+        if output is None and name == 'boxplot':
+            continue
+        if selected is None or name in selected:
+            results.append({'stage': name, **record})
+        # Etapas que não transformam os dados repassam a entrada adiante
+        data = output if isinstance(output, pd.DataFrame) and name != 'station_prediction' else data
+    return results
+
+def git_revision():
+    """
+    Retorna o commit atual (com '-dirty' se houver alterações não gravadas), ou None fora de um repositório git.
+    """
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ('-dirty' if dirty else '')
+
+def benchmark(station_counts, epochs, repeat, selected, generator_options):
+    """
+    Mede as etapas para cada número de estações: mediana do tempo em 'repeat' execuções
+    e memória de uma execução adicional com tracemalloc.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_stations in station_counts:
+            path = os.path.join(directory, f"metro_{n_stations}.csv")
+            rows = write_metro(path, n_stations, **generator_options)
+            runs = [run_stages(path, epochs, selected, memory=False) for _ in range(repeat)]
+            memory = {record['stage']: record for record in run_stages(path, epochs, selected, memory=True)}
+            for index, record in enumerate(runs[0]):
+                wall = float(np.median([run[index]['wall'] for run in runs]))
+                cpu = float(np.median([run[index]['cpu'] for run in runs]))
+                results.append({
+                    'stations': n_stations,
+                    'rows': rows,
+                    'stage': record['stage'],
+                    'rows_in': record['rows_in'],
+                    'wall': wall,
+                    'cpu': cpu,
+                    'rows_per_second': record['rows_in'] / wall if record['rows_in'] else rows / wall,
+                    'tracemalloc_peak_mb': memory[record['stage']]['tracemalloc_peak_mb'],
+                    'peak_rss_mb': memory[record['stage']]['peak_rss_mb'],
+                })
+                print_result(results[-1])
+    return results
+
+def print_result(result, baseline=None):
+    line = (f"{result['stations']:>9} {result['rows']:>10} {result['stage']:>20} {result['wall']:>9.3f}"
+            f" {result['rows_per_second']:>13,.0f} {result['tracemalloc_peak_mb']:>10.1f} {result['peak_rss_mb']:>9.0f}")
+    if baseline is not None:
+        line += f" {baseline['wall'] / result['wall']:>9.2f}x"
+    print(line, flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark das etapas com dados sintéticos no formato de metro.csv.")
+    parser.add_argument('--stations', type=int, nargs='+', default=[50, 500, 5000], help="Números de estações a medir.")
+    parser.add_argument('--first-year', type=int, default=1998, help="Primeiro ano dos dados sintéticos.")
+    parser.add_argument('--last-year', type=int, default=2022, help="Último ano dos dados sintéticos.")
+    parser.add_argument('--leading-nan-rate', type=float, default=0.3, help="Fração de estações inauguradas durante a série.")
+    parser.add_argument('--missing-rate', type=float, default=0.01, help="Fração de registros sem passageiros ao acaso.")
+    parser.add_argument('--double-space-rate', type=float, default=0.2, help="Fração dos registros da Linha 1 com espaço duplo.")
+    parser.add_argument('--stages', nargs='+', default=None, help="Etapas a reportar (padrão: todas).")
+    parser.add_argument('--epochs', type=int, default=50, help="Épocas da previsão por estação.")
+    parser.add_argument('--repeat', type=int, default=3, help="Execuções para a mediana do tempo.")
+    parser.add_argument('--output', default=None, help="Grava os resultados em JSON.")
+    parser.add_argument('--compare', default=None, help="JSON de uma execução anterior para comparar os tempos.")
+    args = parser.parse_args()
+
+    generator_options = {
+        'first_year': args.first_year, 'last_year': args.last_year, 'leading_nan_rate': args.leading_nan_rate,
+        'missing_rate': args.missing_rate, 'double_space_rate': args.double_space_rate,
+    }
+    print(f"{'estações':>9} {'linhas':>10} {'etapa':>20} {'tempo (s)':>9} {'linhas/s':>13} {'pico (MB)':>10} {'RSS (MB)':>9}")
+    results = benchmark(args.stations, args.epochs, args.repeat, args.stages, generator_options)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            previous = json.load(file)
+        baseline = {(result['stations'], result['stage']): result for result in previous['results']}
+        print(f"\nComparação com {previous['revision']} (ganho = tempo anterior / tempo atual)")
+        for result in results:
+            if (result['stations'], result['stage']) in baseline:
+                print_result(result, baseline[(result['stations'], result['stage'])])
+
+    if args.output:
+        report = {
+            'revision': git_revision(),
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'versions': {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+                         'matplotlib': matplotlib.__version__},
+            'parameters': {**generator_options, 'epochs': args.epochs, 'repeat': args.repeat},
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
@@ -0,0 +1,66 @@
+# Benchmark da remoção dos registros iniciais sem passageiros por estação:
+# compara o laço original (filtro + pd.concat por estação) com remove_leading_nan.
+#
+# Uso (a partir da raiz do projeto):
+#   python benchmarks/bench_remove_leading_nan.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from user_data_lib import remove_leading_nan
+
+STATION_COUNTS = [10, 50, 100, 500, 1000]
+MONTHS = 300
+
+def synthetic_metro(n_stations, n_months, seed=0):
+    """
+    Gera um DataFrame no formato de metro.csv com 'n_stations' estações e 'n_months' meses,
+    onde cada estação começa com um número aleatório de meses sem passageiros.
+    """
+    rng = np.random.default_rng(seed)
+    months = pd.date_range("1998-01-01", periods=n_months, freq="MS")
+    station = np.repeat([f"Estação {i:05d}" for i in range(n_stations)], n_months)
+    passengers = rng.integers(10_000, 1_000_000, n_stations * n_months).astype(float)
+    leading = rng.integers(0, 24, n_stations)
+    month_pos = np.tile(np.arange(n_months), n_stations)
+    passengers[month_pos < np.repeat(leading, n_months)] = np.nan
+    passengers[rng.random(passengers.size) < 0.01] = np.nan
+    return pd.DataFrame({
+        "Station": station,
+        "passengers": passengers,
+        "year": np.tile(months.year, n_stations),
+        "year_month": np.tile(months.strftime("%Y-%m-%d"), n_stations),
+    })
+
+def remove_leading_nan_loop(metro_data):
+    """
+    Implementação original de main.py, mantida como referência.
+    """
+    metro_data = metro_data.sort_values(by=['Station', 'year_month']).reset_index(drop=True)
+    metro_data_cleaned = pd.DataFrame()
+    for station in metro_data['Station'].unique():
+        station_data = metro_data[metro_data['Station'] == station]
+        first_non_null_index = station_data['passengers'].first_valid_index()
+        if first_non_null_index is not None:
+            station_data_cleaned = station_data.loc[first_non_null_index:]
+            metro_data_cleaned = pd.concat([metro_data_cleaned, station_data_cleaned], ignore_index=True)
+    return metro_data_cleaned
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    print(f"{'estações':>10} {'linhas':>10} {'laço (s)':>10} {'vetorizado (s)':>15} {'ganho':>8}")
+    for n_stations in STATION_COUNTS:
+        data = synthetic_metro(n_stations, MONTHS)
+        expected, loop_time = timed(remove_leading_nan_loop, data)
+        result, vector_time = timed(remove_leading_nan, data)
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"{n_stations:>10} {len(data):>10} {loop_time:>10.3f} {vector_time:>15.4f} {loop_time / vector_time:>7.1f}x")
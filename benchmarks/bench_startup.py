@@ -0,0 +1,60 @@
+# Benchmark do custo de inicialização (importações) dos módulos de análise,
+# para cada combinação de PLOT e PREDICTION.
+#
+# Cada medição roda em um processo Python novo, para que as importações não fiquem em cache.
+#
+# Uso (a partir da raiz do projeto):
+#   python benchmarks/bench_startup.py
+
+import os
+import sys
+import json
+import subprocess
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEAT = 5
+
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'sklearn', 'PIL', 'tensorflow']
+
+# Código executado no processo filho: sobrescreve a configuração antes de importar os módulos
+CHILD = """
+import sys, time, json
+start = time.perf_counter()
+import config
+config.PLOT = {plot}
+config.PREDICTION = {prediction}
+import user_text_lib, user_load_lib, user_data_lib, user_graph_lib
+imported = time.perf_counter()
+loaded = [name for name in {heavy} if name in sys.modules]
+
+# Primeiro uso real: o que cada configuração efetivamente precisa carregar
+if config.PLOT:
+    import matplotlib.pyplot, seaborn, sklearn.preprocessing
+if config.PREDICTION:
+    import sklearn.preprocessing
+    try:
+        import tensorflow.keras
+    except ImportError:
+        pass
+used = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'first_use': used - imported, 'loaded': loaded}}))
+"""
+
+def measure(plot, prediction):
+    code = CHILD.format(plot=plot, prediction=prediction, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(REPEAT):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return runs
+
+if __name__ == "__main__":
+    print(f"{'PLOT':>6} {'PREDICTION':>11} {'importação (s)':>15} {'primeiro uso (s)':>17}  módulos pesados na importação")
+    for plot in (False, True):
+        for prediction in (False, True):
+            runs = measure(plot, prediction)
+            import_time = statistics.median(run['import'] for run in runs)
+            use_time = statistics.median(run['first_use'] for run in runs)
+            loaded = ", ".join(runs[0]['loaded']) or "-"
+            print(f"{str(plot):>6} {str(prediction):>11} {import_time:>15.3f} {use_time:>17.3f}  {loaded}")
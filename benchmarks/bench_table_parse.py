@@ -0,0 +1,100 @@
+# Benchmark da leitura de tabelas de indicadores formatadas (IBGE / Data.Rio):
+# compara a limpeza original por regex em cada célula (populacao.csv) e a extração das séries
+# com isin/iloc por Nível seguida de uma cadeia de 'where' (pib.csv) com user_table_lib.
+#
+# Uso (a partir da raiz do projeto):
+#   python benchmarks/bench_table_parse.py
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from user_table_lib import read_table, read_wide_table, coalesce
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+SERIES_COUNTS = [3, 30, 300]
+YEARS = list(range(1970, 2024))
+
+def write_population(path, n_rows, seed=0):
+    """
+    Grava um arquivo no formato de populacao.csv (ex.: " 4,251,918 "), com 'n_rows' linhas e ~5% vazias.
+    """
+    rng = np.random.default_rng(seed)
+    values = pd.Series(rng.integers(1_000, 10_000_000, n_rows)).map(lambda value: f" {value:,} ")
+    values[rng.random(n_rows) < 0.05] = ""
+    pd.DataFrame({"Ano": rng.integers(1900, 2024, n_rows), "População": values}).to_csv(path, index=False)
+
+def write_indicators(path, n_series, seed=0):
+    """
+    Grava uma tabela larga no formato de pib.csv com 'n_series' séries (Níveis 1.1, 1.2, ...),
+    cada uma cobrindo um trecho diferente dos anos.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(1e6, 1e9, (n_series, len(YEARS))).round(2)
+    starts = rng.integers(0, len(YEARS), n_series)
+    ends = np.minimum(starts + rng.integers(5, len(YEARS), n_series), len(YEARS))
+    columns = np.arange(len(YEARS))
+    values[(columns < starts[:, None]) | (columns >= ends[:, None])] = np.nan
+    table = pd.DataFrame(values, columns=[str(year) for year in YEARS])
+    table.insert(0, "Indicador", "Série")
+    table.insert(0, "Nível", [f"1.{i + 1}" for i in range(n_series)])
+    table["Unidade"] = "R$"
+    table.to_csv(path, sep=";", index=False)
+
+def population_regex(path):
+    """
+    Implementação original de parse_population, mantida como referência.
+    """
+    data = pd.read_csv(path, dtype={'Ano': 'int16', 'População': str})
+    data['População'] = data['População'].replace({r'[^\d.]': ''}, regex=True).astype(float)
+    return data
+
+def indicators_loop(path, levels):
+    """
+    Implementação original de parse_pib e unify_pib (generalizada para 'levels'), mantida como referência.
+    """
+    data = pd.read_csv(path, delimiter=';', dtype={'Nível': str})
+    data = data[data['Nível'].isin(levels)]
+    years = data.columns[2:-1]
+    table = pd.DataFrame({level: data[data['Nível'] == level].iloc[0, 2:-1].values.astype(float) for level in levels},
+                         index=years.astype(int))
+    unified = table[levels[-1]]
+    for level in reversed(levels[:-1]):
+        unified = unified.where(table[level].isna(), table[level])
+    return unified
+
+def indicators_vectorized(path, levels):
+    table = read_wide_table(path, ['Nível'], {level: level for level in levels})
+    return coalesce(table, levels)
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "populacao.csv")
+        print(f"{'linhas':>10} {'regex (s)':>10} {'vetorizado (s)':>15} {'ganho':>8}")
+        for n_rows in ROW_COUNTS:
+            write_population(path, n_rows)
+            expected, regex_time = timed(population_regex, path)
+            result, vector_time = timed(read_table, path)
+            np.testing.assert_array_equal(result['População'].to_numpy(), expected['População'].to_numpy())
+            print(f"{n_rows:>10} {regex_time:>10.3f} {vector_time:>15.4f} {regex_time / vector_time:>7.1f}x")
+
+        path = os.path.join(folder, "indicadores.csv")
+        print()
+        print(f"{'séries':>10} {'isin/iloc (s)':>14} {'vetorizado (s)':>15} {'ganho':>8}")
+        for n_series in SERIES_COUNTS:
+            write_indicators(path, n_series)
+            levels = [f"1.{i + 1}" for i in range(n_series)]
+            expected, loop_time = timed(indicators_loop, path, levels)
+            result, vector_time = timed(indicators_vectorized, path, levels)
+            np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+            print(f"{n_series:>10} {loop_time:>14.3f} {vector_time:>15.4f} {loop_time / vector_time:>7.1f}x")
@@ -0,0 +1,113 @@
+# Gerador de dados sintéticos no formato de data/metro.csv
+# (Station, subway_line, month, passengers, year, year_month), para testar o
+# desempenho do processamento com volumes muito maiores que o arquivo real.
+#
+# Reproduz os defeitos do arquivo original:
+#   - estações inauguradas depois do início da série, com os meses iniciais sem passageiros;
+#   - valores de passageiros faltando ao acaso;
+#   - espaços duplos no nome de algumas linhas ("Estações da Linha  1").
+#
+# Uso (a partir da raiz do projeto):
+#   python benchmarks/synthetic_metro.py --stations 1000 --output /tmp/metro.csv
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from user_load_lib import MONTHS
+
+def generate_metro(n_stations, first_year=1998, last_year=2022, n_lines=3,
+                   leading_nan_rate=0.3, missing_rate=0.01, double_space_rate=0.2, seed=0):
+    """
+    Gera um DataFrame no formato de metro.csv, com uma linha por estação e mês.
+
+    Parâmetros:
+        - n_stations (int): Número de estações.
+        - first_year (int): Primeiro ano da série.
+        - last_year (int): Último ano da série.
+        - n_lines (int): Número de linhas do metrô; as estações são distribuídas entre elas.
+        - leading_nan_rate (float): Fração das estações inauguradas depois do início da série
+          (meses iniciais sem passageiros).
+        - missing_rate (float): Fração dos demais registros sem passageiros, ao acaso.
+        - double_space_rate (float): Fração dos registros da primeira linha gravados com
+          espaço duplo no nome ("Estações da Linha  1").
+        - seed (int): Semente do gerador aleatório.
+
+    Retorna:
+        - DataFrame com as colunas de metro.csv, com os mesmos tipos do arquivo lido sem conversões
+          (textos, passageiros como float com NaN, 'year_month' como 'AAAA-MM-01').
+    """
+    rng = np.random.default_rng(seed)
+    months = pd.date_range(f"{first_year}-01-01", f"{last_year}-12-01", freq="MS")
+    n_months = len(months)
+    size = n_stations * n_months
+
+    # Estação e linha de cada registro (ordenado por estação e mês, como no arquivo original)
+    station_ids = np.repeat(np.arange(n_stations), n_months)
+    month_pos = np.tile(np.arange(n_months), n_stations)
+    station_names = np.array([f"Estação {i:05d}" for i in range(n_stations)], dtype=object)
+    line_names = np.array([f"Estações da Linha {line + 1}" for line in range(n_lines)], dtype=object)
+    line = rng.integers(0, n_lines, n_stations)[station_ids]
+    subway_line = line_names[line]
+    defect = (line == 0) & (rng.random(size) < double_space_rate)
+    subway_line[defect] = "Estações da Linha  1"
+
+    # Passageiros: nível por estação, tendência anual e sazonalidade mensal, com ruído
+    level = rng.lognormal(np.log(300_000), 0.6, n_stations)[station_ids]
+    trend = (1 + rng.normal(0.02, 0.02, n_stations)[station_ids]) ** (month_pos / 12)
+    season = 1 + 0.1 * np.sin(2 * np.pi * month_pos / 12)
+    passengers = np.round(level * trend * season * rng.normal(1, 0.05, size))
+
+    # Estações inauguradas durante a série: meses anteriores à inauguração sem passageiros
+    opening = np.where(rng.random(n_stations) < leading_nan_rate, rng.integers(1, n_months, n_stations), 0)
+    passengers[month_pos < opening[station_ids]] = np.nan
+    passengers[rng.random(size) < missing_rate] = np.nan
+
+    return pd.DataFrame({
+        'Station': station_names[station_ids],
+        'subway_line': subway_line,
+        'month': np.array(MONTHS, dtype=object)[months.month - 1][month_pos],
+        'passengers': passengers,
+        'year': months.year.to_numpy()[month_pos],
+        'year_month': months.strftime('%Y-%m-%d').to_numpy()[month_pos],
+    })
+
+def write_metro(path, n_stations, **options):
+    """
+    Gera os dados sintéticos e os grava em 'path' no formato de metro.csv
+    (passageiros como inteiros, vazios quando faltantes).
+
+    Parâmetros:
+        - path (str): Caminho do arquivo CSV.
+        - n_stations (int): Número de estações.
+        - options: Demais parâmetros de generate_metro.
+
+    Retorna:
+        - int: Número de linhas gravadas.
+    """
+    data = generate_metro(n_stations, **options)
+    data['passengers'] = data['passengers'].astype('Int64')
+    data.to_csv(path, index=False)
+    return len(data)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um arquivo sintético no formato de data/metro.csv.")
+    parser.add_argument('--stations', type=int, default=1000, help="Número de estações.")
+    parser.add_argument('--first-year', type=int, default=1998, help="Primeiro ano da série.")
+    parser.add_argument('--last-year', type=int, default=2022, help="Último ano da série.")
+    parser.add_argument('--lines', type=int, default=3, help="Número de linhas do metrô.")
+    parser.add_argument('--leading-nan-rate', type=float, default=0.3, help="Fração de estações inauguradas durante a série.")
+    parser.add_argument('--missing-rate', type=float, default=0.01, help="Fração de registros sem passageiros ao acaso.")
+    parser.add_argument('--double-space-rate', type=float, default=0.2, help="Fração dos registros da Linha 1 com espaço duplo.")
+    parser.add_argument('--seed', type=int, default=0, help="Semente do gerador aleatório.")
+    parser.add_argument('--output', default='metro_synthetic.csv', help="Arquivo CSV de saída.")
+    args = parser.parse_args()
+
+    rows = write_metro(args.output, args.stations, first_year=args.first_year, last_year=args.last_year,
+                       n_lines=args.lines, leading_nan_rate=args.leading_nan_rate, missing_rate=args.missing_rate,
+                       double_space_rate=args.double_space_rate, seed=args.seed)
+    print(f"{rows} linhas gravadas em {args.output}")
@@ -10,10 +10,43 @@ SHOW = False
 # Define se os gráficos gerados devem ser salvos em arquivos
 SAVE = True
 
+# Define se os gráficos devem ser renderizados em paralelo, em um pool de processos,
+# ao final do processamento (render_queue). Nesse modo os gráficos não são exibidos na tela.
+PARALLEL_PLOT = False
+
+# Número de processos para a renderização paralela (None = número de CPUs)
+PLOT_WORKERS = None
+
+# Pula a renderização de gráficos cuja imagem salva já foi gerada com os mesmos dados,
+# rótulos, parâmetros, código de desenho e versões das bibliotecas
+RENDER_CACHE = True
+
+# Modo de pré-visualização: imagens em baixa resolução (PREVIEW_DPI), salvas em 'images/preview',
+# para iterar rapidamente sem sobrescrever as imagens finais (300 dpi)
+PREVIEW = False
+PREVIEW_DPI = 72
+
+# Número de estações por imagem no boxplot por estação (None = todas em uma única imagem)
+BOXPLOT_PAGE_SIZE = None
+
+## Configurações de Cache
+# Habilita o cache binário (Parquet) dos arquivos de dados já lidos e tipados
+CACHE = True
+
+# Pasta onde os arquivos de cache são gravados
+CACHE_DIR = "cache"
+
+## Configurações de Carregamento
+# Leitura concorrente das três fontes (metrô, população e PIB): "thread", "process" ou None (em sequência)
+LOAD_EXECUTOR = "thread"
+
 ## Configurações da Rede Neural
 # Habilita ou desabilita o treinamento e previsão da rede neural
 PREDICTION = True
 
+# Habilita também a previsão de passageiros por estação (todas as estações treinadas em lote)
+STATION_PREDICTION = False
+
 # Ano de corte para divisão dos dados entre treino e teste; dados de teste a partir do ano seguinte
 split_year = 2015
 
@@ -23,7 +56,85 @@ epochs = 500
 # Tamanho do batch (lote) de dados a ser processado em cada passo do treinamento
 batch_size = 4
 
+# Últimos anos do treino separados para validação (monitorados pela parada antecipada);
+# 0 = sem validação, monitorando a perda de treino
+VALIDATION_YEARS = 2
+
+# Parada antecipada: épocas sem melhora da perda monitorada antes de parar e restaurar
+# os melhores pesos (None = sempre treinar todas as épocas)
+EARLY_STOPPING_PATIENCE = 50
+
+# Ajuste da taxa de aprendizado durante o treino:
+# "plateau" = reduz pela metade após LR_PATIENCE épocas sem melhora, "cosine" = decaimento cosseno, None = fixa
+LR_SCHEDULE = "plateau"
+LR_PATIENCE = 20
+
+# Tempo máximo de treinamento, em segundos (None = sem limite)
+TRAIN_TIME_BUDGET = None
+
+# Intervalos de previsão: "bootstrap" = conjunto de redes treinadas juntas em lote (NumPy), cada uma
+# com uma reamostragem dos anos de treino; "mc_dropout" = várias passagens com dropout ativo na previsão;
+# None = somente a previsão pontual
+ENSEMBLE = "bootstrap"
+
+# Número de redes do conjunto (ou de passagens com dropout) e percentis da faixa de previsão
+ENSEMBLE_SIZE = 32
+INTERVAL_PERCENTILES = (5, 95)
+
+# Retreino incremental: quando a janela de treino cresce (novos anos), parte dos pesos e do normalizador
+# do último modelo treinado e faz apenas um ajuste fino de WARM_START_EPOCHS épocas
+WARM_START = False
+WARM_START_EPOCHS = 50
+
+# Compara o ajuste fino com um retreino completo (MSE de teste e tempo) a cada previsão
+WARM_START_COMPARE = False
+
+# Previsão além dos dados: número de anos futuros, a partir do último ano com dados completos
+FORECAST_HORIZON = 5
+
+# Cenários da previsão futura: nome -> fator aplicado a cada variável no último ano
+# (o cenário "Base" parte dos valores observados e é sempre incluído)
+FORECAST_SCENARIOS = {"PIB +10%": {"PIB": 1.10}, "PIB -10%": {"PIB": 0.90}}
+
+# Backend do modelo de previsão:
+# "keras" = rede neural no TensorFlow, "numpy" = mesma rede implementada em NumPy (sem TensorFlow),
+# "ridge" = regressão linear autorregressiva em forma fechada (linha de base)
+MODEL_BACKEND = "keras"
+
+# Reaproveita modelos já treinados com os mesmos dados, hiperparâmetros e arquitetura
+MODEL_CACHE = True
+
+# Pasta onde os pesos e normalizadores dos modelos treinados são gravados
+MODEL_DIR = "models"
+
 ## Configurações de Detalhamento e Depuração
 # Nível de detalhamento nas saídas de depuração:
 # 0 = Nenhum output, 1 = Saída mínima (seções), 2 = Saída detalhada, 3 = Saída completa (para debug profundo)
 DEBUG_LEVEL = 3
+
+# Número máximo de linhas exibidas de cada DataFrame nas saídas de depuração (None = todas)
+MAX_ROWS = 500
+
+# Arquivo onde as saídas de depuração são gravadas (None = exibir na tela)
+LOG_FILE = None
+
+## Configurações de Instrumentação
+# Mede tempo de relógio, tempo de CPU, memória e linhas de entrada/saída de cada etapa
+# e de cada função pública, gravando um relatório JSON ao final da execução
+INSTRUMENT = False
+
+# Arquivo do relatório JSON da execução
+REPORT_FILE = "run_report.json"
+
+# Grava também um perfil cProfile de cada etapa (um arquivo .prof por etapa)
+PROFILE_STAGES = False
+
+# Pasta dos perfis cProfile
+PROFILE_DIR = "profiles"
+
+## Configurações de Correlação
+# Tamanho (em anos) das janelas móveis de correlação entre passageiros, PIB e população
+CORRELATION_WINDOW = 10
+
+# Número de estações exibidas no heatmap das estações mais correlacionadas com o PIB
+CORRELATION_TOP_K = 15
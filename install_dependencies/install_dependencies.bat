@@ -2,4 +2,5 @@ pip install pandas
 pip install matplotlib
 pip install scikit-learn
 pip install seaborn
-pip install tensorflow
\ No newline at end of file
+pip install tensorflow
+pip install pyarrow
\ No newline at end of file
@@ -5,201 +5,269 @@
 # pip install scikit-learn
 # pip install seaborn
 # pip install tensorflow
+# pip install pyarrow
 
 # Módulos do Usuário
-from config import split_year, epochs, batch_size
+from config import split_year, epochs, batch_size, CORRELATION_WINDOW, CORRELATION_TOP_K
+from user_pipeline_lib import stage, run_pipeline, STAGES
+from user_instrument_lib import write_report
+from user_append_lib import append_metro
+from user_matrix_lib import MetroMatrix
+from user_corr_lib import correlation_matrix, rolling_correlation
 from user_text_lib import p, secao, list_station
-from user_data_lib import prediction, data_profile, analyse_pax
-from user_graph_lib import plot_line, plot_minmax, plot_boxplot, plot_correlation_heatmap, plot_scatter
+from user_data_lib import load_sources, prediction, data_profile, analyse_pax, missing_report, remove_leading_nan
+from user_data_lib import station_prediction, fix_subway_line, interpolate_population, unify_pib, combine_data
+from user_graph_lib import plot_line, plot_minmax, plot_boxplot, plot_correlation_heatmap, plot_scatter, render_queue
 
-# Outros Módulos -- Instalar Dependências
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+# Outros Módulos
+import argparse
 
-### Importacao e Analise de Dados do Metro
-
-# Carregar o arquivo CSV de dados do metrô
-metro_data = pd.read_csv('data/metro.csv')
-# Perfil dos Dados
-data_profile(metro_data)
-
-# Data profiling mostra que o arquivo tem 4 linhas de metrô,
-# mas no Rio só existem 3 linhas: 1, 2, 4.
-# Com isso, vamos mostrar na tela os valores únicos das linhas,
-# para tentar descobrir o que está acontecendo.
-secao("Valores únicos subway_line")
-p(metro_data.subway_line.unique())
-
-# O problema acontece porque existem espaços duplos no nome da linha 1.
-# "Linha  1" (2 espaços) é a mesma entidade real que "Linha 1".
-# Remover espaços duplos na coluna 'subway_line'
-metro_data['subway_line'] = metro_data['subway_line'].str.replace('  ', ' ', regex=False)
-
-# Verificar a correção conferindo os valores únicos na coluna 'subway_line'
-secao("Valores únicos subway_line corrigida")
-p(metro_data.subway_line.unique())
-
-# Nome da linha resolvido.
-# Data profiling mostra que vários valores de 'passengers' estão faltando.
-# Vamos verificar se está relacionado à data.
-missing_pax_by_month = metro_data.groupby('year_month').agg(
-    missing_count=('passengers', lambda x: x.isnull().sum()),
-    total_stations=('Station', 'nunique')
-).reset_index()
-
-# Exibir os resultados onde há valores ausentes em 'passengers'
-secao("Análise passageiros x tempo") 
-p(missing_pax_by_month[missing_pax_by_month['missing_count'] > 0]) 
-
-# Todos os dados a partir de 2023-04-01 estão sem passageiros.
-# Já podemos remover todas as linhas referentes ao ano de 2023 do conjunto de dados 'metro_data'
-metro_data = metro_data[metro_data['year'] != 2023]
-
-# Mesmo assim, existem várias outras linhas não relacionadas a isso.
-# Tentando encontrar um padrão olhando para o detalhe de cada estação, o número de registros sem 'passengers' comparado com o total da estação.
-# Analisar por estação
-analyse_pax(metro_data)
-
-# Essa análise mostra algumas estações com 12% e 8% de dados faltantes, o que é considerável.
-# Vamos ver os detalhes de alguns desses casos.
-
-list_station(metro_data,"Ipanema / General Osório")
-
-list_station(metro_data,"São Conrado")
-
-# Em ambos os casos, os dados iniciais de passageiros das estações começam com NaN.
-# Hipótese: no ano de inauguração da estação foram incluídos registros desde o mês 1,
-# porém sem valor de passageiros, pois a linha não estava operando. Eliminar essas linhas iniciais
-metro_data = metro_data.sort_values(by=['Station', 'year_month']).reset_index(drop=True)
-metro_data_cleaned = pd.DataFrame()  
-for station in metro_data['Station'].unique():
-    station_data = metro_data[metro_data['Station'] == station]
-    first_non_null_index = station_data['passengers'].first_valid_index()
-    if first_non_null_index is not None:
-        station_data_cleaned = station_data.loc[first_non_null_index:]
-        metro_data_cleaned = pd.concat([metro_data_cleaned, station_data_cleaned], ignore_index=True)
-metro_data = metro_data_cleaned
-
-# Analisar por estação novamente para ver se as mudanças tiveram efeito
-analyse_pax(metro_data)
-
-# Depois dessas intervenções, somente 9 registros, em apenas 1 estação, ficaram sem os dados de passageiros.
-# Decidimos não preencher esses dados e aceitar que o movimento foi zero no período.
-plot_boxplot(metro_data, 'year', 'passengers', 'Station', 4, "", "Pax / Mês", "BoxPlot - Distribuição de Passageiros Mensais. Categorizado por Estação, por Ano")
-
-### Importacao e Analise de Dados de Populacao
+# O processamento é dividido em etapas (load -> clean -> consolidate -> plot -> predict).
+# Cada etapa declara suas entradas e as configurações que usa; o resultado é gravado em cache
+# e só é recalculado quando o código, as configurações, os arquivos ou as entradas mudam.
 
-# Ao ver o arquivo CSV, logo nas primeiras linhas, é fácil notar que o campo
-# referente à população está mal formatado. Removendo espaços e vírgulas para
-# importá-lo como número.
-population_data = pd.read_csv('data/populacao.csv')
-population_data['População'] = population_data['População'].replace({r'[^\d.]': ''}, regex=True).astype(float)
+PLOT_PARAMS = ('PLOT', 'SAVE', 'SHOW', 'PARALLEL_PLOT', 'RENDER_CACHE', 'PREVIEW', 'PREVIEW_DPI')
 
-# Perfil dos Dados
-data_profile(population_data)
+# Configurações do treinamento, das faixas de previsão e da previsão futura usadas pela etapa 'prediction'
+PREDICTION_PARAMS = ('PREDICTION', 'split_year', 'epochs', 'batch_size', 'MODEL_BACKEND',
+                     'VALIDATION_YEARS', 'EARLY_STOPPING_PATIENCE', 'LR_SCHEDULE', 'LR_PATIENCE', 'TRAIN_TIME_BUDGET',
+                     'ENSEMBLE', 'ENSEMBLE_SIZE', 'INTERVAL_PERCENTILES', 'WARM_START', 'WARM_START_EPOCHS',
+                     'WARM_START_COMPARE', 'FORECAST_HORIZON', 'FORECAST_SCENARIOS')
 
-# Data profile mostra 2 linhas sem informação. Quais são?
-secao("Anos sem dados de população")
-p(population_data[population_data['População'].isna()])
+### Leitura dos arquivos
 
-# Estimar os valores de população para os anos de 2022 e 2023 por interpolação linear
-population_data = population_data.sort_values(by="Ano").reset_index(drop=True)
-population_data['População'] = population_data['População'].interpolate(method='linear')
+@stage("sources", files=('data/metro.csv', 'data/populacao.csv', 'data/pib.csv'), params=('LOAD_EXECUTOR',))
+def sources_stage():
+    # As três fontes são independentes até a consolidação: ler os arquivos ao mesmo tempo
+    # (tipados e com cache). A limpeza fica nas etapas seguintes, junto com a análise que a motiva.
+    frames, timings = load_sources(clean=False)
 
-# Exibir as últimas linhas para confirmar a interpolação dos anos 2022 e 2023
-secao("Interpolação anos 2022 e 2023")
-p(population_data.tail(5))
-
-# Como só temos dados de passageiros de 1998 a 2022, manter dados de população apenas nessa faixa
-population_data = population_data[(population_data['Ano'] >= 1998) & (population_data['Ano'] <= 2022)]
-
-### Importacao e Analise de Dados do PIB
+    secao("Tempo de leitura por arquivo (s)")
+    p({name: round(seconds, 3) for name, seconds in timings.items()})
+    return frames
 
-# Carregar o arquivo CSV -- PIB usando ';' como delimitador
-pib_data = pd.read_csv('data/pib.csv', delimiter=';')
+### Importacao e Analise de Dados do Metro
 
-# Perfil dos Dados
-data_profile(pib_data)
+@stage("metro", inputs=("sources",))
+def metro_stage(sources):
+    # Dados do metrô (tipados e com cache)
+    metro_data = sources['metro']
+    # Perfil dos Dados
+    data_profile(metro_data)
+
+    # Data profiling mostra que o arquivo tem 4 linhas de metrô,
+    # mas no Rio só existem 3 linhas: 1, 2, 4.
+    # Com isso, vamos mostrar na tela os valores únicos das linhas,
+    # para tentar descobrir o que está acontecendo.
+    secao("Valores únicos subway_line")
+    p(metro_data.subway_line.unique())
+
+    # O problema acontece porque existem espaços duplos no nome da linha 1.
+    # "Linha  1" (2 espaços) é a mesma entidade real que "Linha 1".
+    # Remover espaços duplos na coluna 'subway_line'
+    metro_data = fix_subway_line(metro_data)
+
+    # Verificar a correção conferindo os valores únicos na coluna 'subway_line'
+    secao("Valores únicos subway_line corrigida")
+    p(metro_data.subway_line.unique())
+
+    # Nome da linha resolvido.
+    # Data profiling mostra que vários valores de 'passengers' estão faltando.
+    # Vamos verificar se está relacionado à data.
+    # Exibir os resultados onde há valores ausentes em 'passengers' (calculados apenas se forem exibidos)
+    secao("Análise passageiros x tempo") 
+    p(lambda: missing_report(metro_data)['month'].query('missing_count > 0'))
+
+    # Todos os dados a partir de 2023-04-01 estão sem passageiros.
+    # Já podemos remover todas as linhas referentes ao ano de 2023 do conjunto de dados 'metro_data'
+    metro_data = metro_data[metro_data['year'] != 2023]
+
+    # Mesmo assim, existem várias outras linhas não relacionadas a isso.
+    # Tentando encontrar um padrão olhando para o detalhe de cada estação, o número de registros sem 'passengers' comparado com o total da estação.
+    # Analisar por estação
+    analyse_pax(metro_data)
+
+    # Essa análise mostra algumas estações com 12% e 8% de dados faltantes, o que é considerável.
+    # Vamos ver os detalhes de alguns desses casos.
+
+    # O filtro de cada estação só é calculado se a listagem for exibida (DEBUG_LEVEL)
+    list_station(metro_data,"Ipanema / General Osório")
+
+    list_station(metro_data,"São Conrado")
+
+    # Em ambos os casos, os dados iniciais de passageiros das estações começam com NaN.
+    # Hipótese: no ano de inauguração da estação foram incluídos registros desde o mês 1,
+    # porém sem valor de passageiros, pois a linha não estava operando. Eliminar essas linhas iniciais
+    metro_data = remove_leading_nan(metro_data)
+
+    # Analisar por estação novamente para ver se as mudanças tiveram efeito
+    analyse_pax(metro_data)
+    return metro_data
+
+@stage("metro_plots", inputs=("metro",), params=("BOXPLOT_PAGE_SIZE",) + PLOT_PARAMS)
+def metro_plots_stage(metro_data):
+    # Depois dessas intervenções, somente 9 registros, em apenas 1 estação, ficaram sem os dados de passageiros.
+    # Decidimos não preencher esses dados e aceitar que o movimento foi zero no período.
+    plot_boxplot(metro_data, 'year', 'passengers', 'Station', 4, "", "Pax / Mês", "BoxPlot - Distribuição de Passageiros Mensais. Categorizado por Estação, por Ano")
 
-# Data profile mais complexo nesse caso. Foi necessário abrir o arquivo para entender sua estrutura.
-# O dado que queremos é composto pelas informações de 3 indicadores. Criar gráfico para entender melhor.
-pib_indicadores = pib_data[pib_data['Nível'].isin(['1.1', '1.2', '1.3'])]
+### Importacao e Analise de Dados de Populacao
 
-anos = pib_indicadores.columns[2:-1]
-pib_indicador_1_1 = pib_indicadores[pib_indicadores['Nível'] == '1.1'].iloc[0, 2:-1].values.astype(float)
-pib_indicador_1_2 = pib_indicadores[pib_indicadores['Nível'] == '1.2'].iloc[0, 2:-1].values.astype(float)
-pib_indicador_1_3 = pib_indicadores[pib_indicadores['Nível'] == '1.3'].iloc[0, 2:-1].values.astype(float)
+@stage("population", inputs=("sources",))
+def population_stage(sources):
+    # Ao ver o arquivo CSV, logo nas primeiras linhas, é fácil notar que o campo
+    # referente à população está mal formatado. O carregamento remove espaços e
+    # vírgulas para importá-lo como número.
+    population_data = sources['population']
 
-# Criar DataFrame
-pib = pd.DataFrame({
-    "Revisado": pib_indicador_1_1,
-    "Retropolado": pib_indicador_1_2,
-    "Encerrado": pib_indicador_1_3
-}, index=anos.astype(int))
+    # Perfil dos Dados
+    data_profile(population_data)
 
-secao("PIB Inicial")
-p(pib)
-plot_line(pib, "Anos", "R$", "Linha - PIB por Ano - Séries Originais")
+    # Data profile mostra 2 linhas sem informação. Quais são?
+    secao("Anos sem dados de população")
+    p(population_data[population_data['População'].isna()])
 
-# Observamos uma regra para a série consolidada:
-# 1.2 tem prioridade sobre 1.3
-# 1.1 tem prioridade sobre 1.3
-# Considerar 1.3 se for a única série com dados.
-pib['Unificado'] = pib['Encerrado']
-pib['Unificado'] = pib['Unificado'].where(pib['Retropolado'].isna(), pib['Retropolado'])
-pib['Unificado'] = pib['Unificado'].where(pib['Revisado'].isna(), pib['Revisado'])
+    # Estimar os valores de população para os anos de 2022 e 2023 por interpolação linear
+    population_data = interpolate_population(population_data)
 
-secao("PIB Unificado")
-p(pib)
-plot_line(pib[['Unificado']], "Anos", "R$", "Linha - PIB por Ano - Série Unificada")
+    # Exibir as últimas linhas para confirmar a interpolação dos anos 2022 e 2023
+    secao("Interpolação anos 2022 e 2023")
+    p(population_data.tail(5))
 
-### Consolidar dados
+    # Como só temos dados de passageiros de 1998 a 2022, manter dados de população apenas nessa faixa
+    population_data = population_data[(population_data['Ano'] >= 1998) & (population_data['Ano'] <= 2022)]
+    return population_data
 
-# Consolidar dados de Passageiros por ano
-total_passengers_by_year = metro_data.groupby('year')['passengers'].sum()
-total_passengers_by_year.index = total_passengers_by_year.index.astype(int)
+### Importacao e Analise de Dados do PIB
 
-# Consolidar dados de População por ano
-population_by_year = population_data.set_index('Ano')['População']
-population_by_year.index = population_by_year.index.astype(int)
+@stage("pib", inputs=("sources",))
+def pib_stage(sources):
+    # Arquivo CSV do PIB (delimitado por ';')
+    # A estrutura do arquivo é mais complexa; foi necessário abri-lo para entendê-la.
+    # O dado que queremos é composto pelas informações de 3 indicadores (Níveis 1.1, 1.2 e 1.3),
+    # que o carregamento extrai em uma coluna por série. Criar gráfico para entender melhor.
+    pib = sources['pib']
 
-# Combinar em um único DataFrame
-combined_data = pd.DataFrame({
-    'Passageiros': total_passengers_by_year,
-    'PIB': pib['Unificado'],
-    'População': population_by_year
-})
+    # Perfil dos Dados
+    data_profile(pib)
 
-secao("Dados Combinados - Todos os Anos")
-p(combined_data)
+    secao("PIB Inicial")
+    p(pib)
 
-# Análise gráfica dos dados combinados
-plot_minmax(combined_data, "Ano", "Normalizado Min-Max", "Linha - Min-Max - Passageiros, PIB e População - Todos os Anos")
+    # Observamos uma regra para a série consolidada:
+    # 1.2 tem prioridade sobre 1.3
+    # 1.1 tem prioridade sobre 1.3
+    # Considerar 1.3 se for a única série com dados.
+    pib = unify_pib(pib)
 
-# Filtrar os dados para o período de 2001 a 2019 para análise de período "bem comportado"
-start_year = 2001
-end_year = 2019
-filtered_data = combined_data[(combined_data.index >= start_year) & (combined_data.index <= end_year)]
-string_years = f"{start_year} a {end_year}"
+    secao("PIB Unificado")
+    p(pib)
+    return pib
 
-# Análise gráfica após correção
-plot_minmax(filtered_data, "Ano", "Normalizado Min-Max", f"Linha - Min-Max - Passageiros, PIB e População - {string_years}")
+@stage("pib_plots", inputs=("pib",), params=PLOT_PARAMS)
+def pib_plots_stage(pib):
+    # Séries originais e série unificada
+    plot_line(pib[['Revisado', 'Retropolado', 'Encerrado']], "Anos", "R$", "Linha - PIB por Ano - Séries Originais")
+    plot_line(pib[['Unificado']], "Anos", "R$", "Linha - PIB por Ano - Série Unificada")
 
-# Gráficos de correlação
-plot_correlation_heatmap(combined_data, "Matriz de Correlação - Passageiros, PIB e População - Todos os Anos")
-plot_scatter(combined_data, 'Passageiros', 'População', "Scatter - Passageiros e População - Todos os Anos")
-plot_scatter(combined_data, 'Passageiros', 'PIB', "Scatter - Passageiros e PIB - Todos os Anos")
+### Consolidar dados
 
-plot_correlation_heatmap(filtered_data, f"Matriz de Correlação - Passageiros, PIB e População - {string_years}")
-plot_scatter(filtered_data, 'Passageiros', 'População', f"Scatter - Passageiros e População - {string_years}")
-plot_scatter(filtered_data, 'Passageiros', 'PIB', f"Scatter - Passageiros e PIB - {string_years}")
+@stage("combined", inputs=("metro", "population", "pib"))
+def combined_stage(metro_data, population_data, pib):
+    # Consolidar dados de Passageiros, PIB e População por ano em um único DataFrame
+    combined_data = combine_data(metro_data, population_data, pib)
+
+    secao("Dados Combinados - Todos os Anos")
+    p(combined_data)
+    return combined_data
+
+@stage("combined_plots", inputs=("combined",), params=PLOT_PARAMS)
+def combined_plots_stage(combined_data):
+    # Análise gráfica dos dados combinados
+    plot_minmax(combined_data, "Ano", "Normalizado Min-Max", "Linha - Min-Max - Passageiros, PIB e População - Todos os Anos")
+
+    # Filtrar os dados para o período de 2001 a 2019 para análise de período "bem comportado"
+    start_year = 2001
+    end_year = 2019
+    filtered_data = combined_data[(combined_data.index >= start_year) & (combined_data.index <= end_year)]
+    string_years = f"{start_year} a {end_year}"
+
+    # Análise gráfica após correção
+    plot_minmax(filtered_data, "Ano", "Normalizado Min-Max", f"Linha - Min-Max - Passageiros, PIB e População - {string_years}")
+
+    # Gráficos de correlação
+    plot_correlation_heatmap(combined_data, "Matriz de Correlação - Passageiros, PIB e População - Todos os Anos")
+    plot_scatter(combined_data, 'Passageiros', 'População', "Scatter - Passageiros e População - Todos os Anos")
+    plot_scatter(combined_data, 'Passageiros', 'PIB', "Scatter - Passageiros e PIB - Todos os Anos")
+
+    plot_correlation_heatmap(filtered_data, f"Matriz de Correlação - Passageiros, PIB e População - {string_years}")
+    plot_scatter(filtered_data, 'Passageiros', 'População', f"Scatter - Passageiros e População - {string_years}")
+    plot_scatter(filtered_data, 'Passageiros', 'PIB', f"Scatter - Passageiros e PIB - {string_years}")
+
+@stage("station_correlation", inputs=("metro_matrix", "combined"), params=('CORRELATION_WINDOW', 'CORRELATION_TOP_K') + PLOT_PARAMS)
+def station_correlation_stage(metro_matrix, combined_data):
+    # Passageiros anuais de cada estação (uma coluna por estação, uma linha por ano)
+    stations = metro_matrix.yearly_by_station().T
+    indicators = combined_data[['PIB', 'População']]
+
+    # Correlação de cada estação com PIB e População (anos sem dados são descartados par a par)
+    correlation = correlation_matrix(stations, indicators)
+    secao("Correlação dos passageiros de cada estação com PIB e População")
+    p(lambda: correlation.sort_values(by='PIB', ascending=False))
+
+    # O recorte fixo de 2001 a 2019 generalizado para janelas móveis de CORRELATION_WINDOW anos
+    rolling = rolling_correlation(combined_data[['Passageiros']], indicators, CORRELATION_WINDOW)
+    secao(f"Correlação dos passageiros com PIB e População em janelas de {CORRELATION_WINDOW} anos (ano final da janela)")
+    p(lambda: rolling.droplevel(0, axis=1))
+
+    # Heatmaps: estações mais correlacionadas com o PIB e todas as estações agrupadas por semelhança
+    plot_correlation_heatmap(stations.join(indicators), f"Matriz de Correlação - {CORRELATION_TOP_K} Estações mais correlacionadas com o PIB",
+                             view='top', k=CORRELATION_TOP_K, reference='PIB')
+    plot_correlation_heatmap(stations, "Matriz de Correlação - Passageiros entre Estações - Agrupada", view='cluster')
+    return {'correlation': correlation, 'rolling': rolling}
 
 ### Estimativa com rede neural
 
-prediction(combined_data, split_year, epochs, batch_size)
-
-print()
-print("------------------------")
-print("PROCESSAMENTO FINALIZADO")
-print("------------------------")
+@stage("prediction", inputs=("combined",), params=PREDICTION_PARAMS + PLOT_PARAMS)
+def prediction_stage(combined_data):
+    return prediction(combined_data, split_year, epochs, batch_size)
+
+@stage("metro_matrix", inputs=("metro",))
+def metro_matrix_stage(metro_data):
+    # Matriz estação x mês gravada em disco (memmap); o resultado guardado pelo pipeline
+    # é apenas a referência à pasta, reaberta sem cópia por quem a usar
+    return MetroMatrix.from_frame(metro_data).save()
+
+@stage("station_prediction", inputs=("metro_matrix",), params=('PREDICTION', 'STATION_PREDICTION', 'split_year', 'epochs', 'batch_size'))
+def station_prediction_stage(metro_matrix):
+    # Previsão por estação (somente quando STATION_PREDICTION estiver habilitado)
+    return station_prediction(metro_matrix, split_year, epochs, batch_size)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Análise e previsão de passageiros do metrô, PIB e população do Rio de Janeiro.")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=None,
+                        help="Etapas a executar (padrão: todas). Dependências desatualizadas também são executadas.")
+    parser.add_argument('--force', action='store_true', help="Reexecutar as etapas pedidas mesmo sem alterações.")
+    parser.add_argument('--append', metavar='CSV', default=None,
+                        help="Modo incremental: incorpora apenas os novos registros do metrô (ex.: o último mês) aos agregados gravados.")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.append:
+        # Atualiza os agregados por ano, estação e mês sem reprocessar o histórico;
+        # na primeira vez, o estado é criado a partir do resultado da etapa 'metro'
+        append_metro(args.append, history=lambda: run_pipeline(['metro'])['metro'])
+    else:
+        run_pipeline(args.stages, force=args.force)
+
+    ### Renderizar os gráficos enfileirados (somente quando PARALLEL_PLOT estiver habilitado)
+
+    render_queue()
+
+    # Gravar o relatório de tempo e memória (somente quando INSTRUMENT estiver habilitado)
+    write_report()
+
+    print()
+    print("------------------------")
+    print("PROCESSAMENTO FINALIZADO")
+    print("------------------------")
@@ -0,0 +1,36 @@
+# Varredura de hiperparâmetros da rede neural
+#
+# Prepara os dados combinados uma única vez e treina um modelo por combinação
+# de ano de divisão, épocas e batch size, em paralelo.
+#
+# Uso:
+#   python sweep.py --split-years 2013 2015 --epochs 100 500 --batch-sizes 4 8 --output sweep.csv
+
+# Módulos do Usuário
+from config import split_year, epochs, batch_size
+from user_text_lib import secao, p
+from user_data_lib import prepare_combined_data
+from user_sweep_lib import run_sweep
+
+# Outros Módulos
+import argparse
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Varredura de hiperparâmetros da rede neural.")
+    parser.add_argument('--split-years', type=int, nargs='+', default=[split_year], help="Anos de divisão entre treino e teste.")
+    parser.add_argument('--epochs', type=int, nargs='+', default=[epochs], help="Números de épocas.")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[batch_size], help="Tamanhos de batch.")
+    parser.add_argument('--workers', type=int, default=None, help="Número de processos (padrão: número de CPUs).")
+    parser.add_argument('--output', default=None, help="Arquivo CSV para gravar a tabela de resultados.")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    combined_data = prepare_combined_data()
+    results = run_sweep(combined_data, args.split_years, args.epochs, args.batch_sizes, args.workers)
+
+    secao("Resultados da varredura")
+    p(results)
+    if args.output:
+        results.to_csv(args.output, index=False)
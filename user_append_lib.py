@@ -0,0 +1,192 @@
+# Módulos do Usuário
+from config import CACHE_DIR
+from user_text_lib import secao, p
+from user_load_lib import parse_metro
+from user_data_lib import fix_subway_line
+from user_instrument_lib import instrument_module
+
+# Importação de outros módulos necessários
+import os
+import pickle
+import pandas as pd
+
+# Arquivo com o estado do modo incremental (agregados por ano, por estação e por mês)
+STATE_FILE = os.path.join(CACHE_DIR, "metro_state.pkl")
+
+# Versão do formato do estado; incrementar sempre que a estrutura mudar
+STATE_VERSION = 1
+
+def empty_state():
+    """
+    Retorna um estado vazio do modo incremental.
+
+    O estado guarda apenas agregados, cujo tamanho depende do número de estações, meses e anos,
+    e não do número de registros do histórico:
+        - 'stations': por estação, a linha, o mês do primeiro valor válido (NaT se ainda não houve),
+          registros, registros sem passageiros e total de passageiros, após a limpeza;
+        - 'months': por mês, registros sem passageiros, registros e estações com registros;
+        - 'yearly': total de passageiros por ano (float64);
+        - 'last_month': último mês já incorporado.
+    """
+    return {
+        'version': STATE_VERSION,
+        'last_month': None,
+        'stations': pd.DataFrame({
+            'subway_line': pd.Series(dtype=object),
+            'first_valid': pd.Series(dtype='datetime64[ns]'),
+            'total_count': pd.Series(dtype='int64'),
+            'missing_count': pd.Series(dtype='int64'),
+            'passengers': pd.Series(dtype='float64'),
+        }, index=pd.Index([], dtype=object, name='Station')),
+        'months': pd.DataFrame({
+            'missing_count': pd.Series(dtype='int64'),
+            'total_count': pd.Series(dtype='int64'),
+            'total_stations': pd.Series(dtype='int64'),
+        }, index=pd.DatetimeIndex([], name='year_month')),
+        'yearly': pd.Series(dtype='float64', index=pd.Index([], dtype='int64', name='year'), name='passengers'),
+    }
+
+def load_state(path=STATE_FILE):
+    """
+    Lê o estado gravado do modo incremental.
+
+    Retorna:
+        - dict com o estado, ou None se não existir (ou for de uma versão anterior).
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as file:
+        state = pickle.load(file)
+    return state if state.get('version') == STATE_VERSION else None
+
+def save_state(state, path=STATE_FILE):
+    """
+    Grava o estado do modo incremental (substituindo o arquivo anterior de forma atômica).
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f"{path}.tmp", 'wb') as file:
+        pickle.dump(state, file)
+    os.replace(f"{path}.tmp", path)
+
+def validate_rows(state, rows):
+    """
+    Verifica se os novos registros podem ser incorporados ao estado: colunas obrigatórias,
+    meses posteriores ao último já incorporado, sem registros repetidos por estação e mês
+    e sem passageiros negativos. Gera ValueError caso contrário.
+    """
+    missing_columns = {'Station', 'subway_line', 'passengers', 'year', 'year_month'} - set(rows.columns)
+    if missing_columns:
+        raise ValueError(f"Colunas ausentes nos novos dados: {sorted(missing_columns)}")
+    if state['last_month'] is not None and (rows['year_month'] <= state['last_month']).any():
+        raise ValueError(f"Os novos dados devem ser posteriores a {state['last_month']:%Y-%m}, o último mês já incorporado")
+    if rows.duplicated(['Station', 'year_month']).any():
+        raise ValueError("Os novos dados têm mais de um registro para a mesma estação e mês")
+    if (rows['passengers'] < 0).any():
+        raise ValueError("Os novos dados têm valores negativos de passageiros")
+
+def update_state(state, rows):
+    """
+    Incorpora novos registros do metrô ao estado, com a mesma limpeza do processamento completo:
+    nomes de linha com espaços duplos corrigidos e registros iniciais sem passageiros de cada
+    estação descartados (usando o estado para saber se a estação já teve um valor válido).
+    O custo é proporcional aos novos registros e ao número de estações, não ao histórico.
+
+    Parâmetros:
+        - state (dict): Estado atual (ver empty_state); não é alterado.
+        - rows (DataFrame): Novos registros, no formato de metro.csv (ex.: um mês).
+
+    Retorna:
+        - tuple (dict, DataFrame): Novo estado e os novos registros já limpos.
+    """
+    validate_rows(state, rows)
+    rows = fix_subway_line(rows)
+    rows = rows.assign(Station=rows['Station'].astype(str), subway_line=rows['subway_line'].astype(str))
+    rows = rows.sort_values(by=['Station', 'year_month']).reset_index(drop=True)
+
+    # Registros iniciais sem passageiros: descartados até o primeiro valor válido da estação,
+    # considerando os valores válidos já vistos em meses anteriores
+    started = rows['Station'].map(state['stations']['first_valid'].notna()).fillna(False).astype(bool)
+    seen_valid = (rows['passengers'].notna() | started).groupby(rows['Station'], sort=False).cummax()
+    cleaned = rows[seen_valid].reset_index(drop=True)
+    missing = cleaned['passengers'].isna()
+    passengers = cleaned['passengers'].astype('float64')
+
+    # Agregados por estação: estações novas entram no estado mesmo sem valores válidos
+    stations = state['stations'].reindex(state['stations'].index.union(pd.Index(rows['Station'].unique())).rename('Station'))
+    stations['subway_line'] = rows.groupby('Station')['subway_line'].last().reindex(stations.index).fillna(stations['subway_line'])
+    first_valid = cleaned.loc[~missing].groupby('Station')['year_month'].min()
+    stations['first_valid'] = stations['first_valid'].fillna(first_valid.reindex(stations.index))
+    by_station = pd.DataFrame({'total_count': 1, 'missing_count': missing, 'passengers': passengers}).groupby(cleaned['Station']).sum()
+    for column in ['total_count', 'missing_count', 'passengers']:
+        stations[column] = stations[column].fillna(0).add(by_station[column], fill_value=0).astype(state['stations'][column].dtype)
+
+    # Agregados por mês (sempre meses novos) e por ano
+    by_month = pd.DataFrame({
+        'missing_count': missing.groupby(cleaned['year_month']).sum(),
+        'total_count': missing.groupby(cleaned['year_month']).size(),
+        'total_stations': cleaned.groupby('year_month')['Station'].nunique(),
+    }).astype('int64')
+    months = pd.concat([state['months'], by_month]) if len(state['months']) else by_month
+    yearly = state['yearly'].add(passengers.groupby(cleaned['year'].astype('int64')).sum(), fill_value=0)
+
+    new_state = {
+        'version': STATE_VERSION,
+        'last_month': max(filter(None, [state['last_month'], rows['year_month'].max()])) if len(rows) else state['last_month'],
+        'stations': stations,
+        'months': months,
+        'yearly': yearly.rename('passengers'),
+    }
+    return new_state, cleaned
+
+def state_report(state):
+    """
+    Relatório de dados faltantes e totais a partir do estado, no mesmo formato de missing_report
+    (sem o nível 'line'), mais o total de passageiros por ano.
+
+    Retorna:
+        - dict com os DataFrames 'station' e 'month', a Series 'total' e a Series 'yearly'.
+    """
+    def with_percentage(data):
+        return data.assign(missing_percentage=data['missing_count'] / data['total_count'] * 100)
+
+    stations = state['stations']
+    total = stations[['missing_count', 'total_count']].sum()
+    total['missing_percentage'] = total['missing_count'] / total['total_count'] * 100
+    return {
+        'station': with_percentage(stations.loc[stations['total_count'] > 0, ['missing_count', 'total_count']]).reset_index(),
+        'month': with_percentage(state['months']).reset_index(),
+        'total': total,
+        'yearly': state['yearly'],
+    }
+
+def append_metro(path, history, state_path=STATE_FILE):
+    """
+    Modo incremental: lê um arquivo apenas com os novos registros do metrô (ex.: o mês mais recente),
+    incorpora-os ao estado gravado e exibe os agregados atualizados.
+
+    Parâmetros:
+        - path (str): Arquivo CSV com os novos registros, no formato de metro.csv.
+        - history (callable): Função que retorna o histórico completo já limpo; só é chamada
+          na primeira vez, quando ainda não existe estado gravado.
+        - state_path (str): Arquivo do estado.
+
+    Retorna:
+        - tuple (dict, DataFrame): Estado atualizado e os novos registros já limpos.
+    """
+    state = load_state(state_path)
+    if state is None:
+        secao("Modo incremental: criando o estado a partir do histórico")
+        state, _ = update_state(empty_state(), history())
+
+    state, cleaned = update_state(state, parse_metro(path))
+    save_state(state, state_path)
+
+    secao(f"Modo incremental: {len(cleaned)} registros incorporados (até {state['last_month']:%Y-%m})")
+    report = state_report(state)
+    p(lambda: report['yearly'].to_frame())
+    p(lambda: report['month'].tail(12))
+    p(lambda: report['station'].query('missing_count > 0').sort_values(by='missing_percentage', ascending=False))
+    return state, cleaned
+
+# Instrumentação das funções públicas (somente quando INSTRUMENT estiver habilitado)
+instrument_module(globals())
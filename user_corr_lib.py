@@ -0,0 +1,175 @@
+# Importação de outros módulos necessários
+import numpy as np
+import pandas as pd
+
+# Número de séries processadas por bloco; limita a memória a O(tempo x bloco x séries de referência)
+BLOCK_SIZE = 256
+
+def as_frame(data):
+    """
+    Converte os dados (DataFrame, Series ou array tempo x séries) para DataFrame float64.
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    if not isinstance(data, pd.DataFrame):
+        data = pd.DataFrame(np.asarray(data))
+    return data.astype('float64')
+
+def rank_columns(data):
+    """
+    Postos (ranks) de cada série, com empates pela média e NaN preservado, para a correlação de Spearman.
+    Cada série é ordenada com todos os seus valores válidos, e não apenas com os pares
+    completos de cada combinação (igual a DataFrame.corr('spearman') quando não há NaN).
+    """
+    return data.rank(method='average')
+
+def pairwise_sums(x, y):
+    """
+    Somas usadas na correlação com NaN tratado par a par: para cada par de colunas (i, j), só entram
+    os instantes em que as duas séries têm valor. Retorna n, Σx, Σy, Σx², Σy² e Σxy, cada um (i, j).
+    """
+    mask_x, mask_y = ~np.isnan(x), ~np.isnan(y)
+    x, y = np.where(mask_x, x, 0.0), np.where(mask_y, y, 0.0)
+    mask_x, mask_y = mask_x.astype(np.float64), mask_y.astype(np.float64)
+    return (mask_x.T @ mask_y, x.T @ mask_y, mask_x.T @ y,
+            (x * x).T @ mask_y, mask_x.T @ (y * y), x.T @ y)
+
+def correlation_from_sums(n, sx, sy, sxx, syy, sxy, min_periods):
+    """
+    Coeficiente de Pearson a partir das somas; NaN quando há menos de 'min_periods' pares
+    ou quando uma das séries é constante no período comum.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        r = cov / np.sqrt(var_x * var_y)
+    r[(n < min_periods) | ~(var_x > 0) | ~(var_y > 0)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+def correlation_matrix(data, other=None, method='pearson', min_periods=3, block_size=BLOCK_SIZE):
+    """
+    Matriz de correlação entre as séries (colunas) de 'data' e as de 'other' (ou de 'data' com ela
+    mesma), calculada em blocos de colunas e com NaN tratado par a par, como DataFrame.corr().
+
+    Parâmetros:
+        - data (DataFrame): Séries nas colunas, tempo nas linhas.
+        - other (DataFrame): Séries de referência, com o mesmo índice de tempo (None = 'data').
+        - method (str): 'pearson' ou 'spearman'.
+        - min_periods (int): Mínimo de instantes em comum para calcular um par.
+        - block_size (int): Número de colunas de 'data' por bloco.
+
+    Retorna:
+        - DataFrame (séries de 'data' x séries de 'other') com os coeficientes.
+    """
+    if method not in ('pearson', 'spearman'):
+        raise ValueError(f"Método de correlação desconhecido: {method!r} (use 'pearson' ou 'spearman')")
+    data = as_frame(data)
+    other = data if other is None else as_frame(other).reindex(data.index)
+    if method == 'spearman':
+        data, other = rank_columns(data), rank_columns(other)
+
+    # Centralizar cada série pela sua média reduz o erro numérico das somas
+    x = (data - data.mean()).to_numpy()
+    y = (other - other.mean()).to_numpy()
+
+    result = np.empty((x.shape[1], y.shape[1]))
+    for start in range(0, x.shape[1], block_size):
+        block = slice(start, start + block_size)
+        result[block] = correlation_from_sums(*pairwise_sums(x[:, block], y), min_periods)
+    return pd.DataFrame(result, index=data.columns, columns=other.columns)
+
+def rolling_correlation(data, other, window, min_periods=None, method='pearson', block_size=BLOCK_SIZE):
+    """
+    Correlação de cada série de 'data' com cada série de 'other' em janelas deslizantes de
+    'window' instantes (ex.: anos), calculada para todas as janelas de uma só vez com somas
+    acumuladas ao longo do tempo, em blocos de colunas de 'data'. NaN é tratado par a par.
+
+    Parâmetros:
+        - data (DataFrame): Séries nas colunas, tempo nas linhas.
+        - other (DataFrame): Séries de referência, com o mesmo índice de tempo.
+        - window (int): Tamanho da janela.
+        - min_periods (int): Mínimo de pares válidos na janela (None = 'window').
+        - method (str): 'pearson' ou 'spearman' (postos calculados na série inteira, não por janela).
+        - block_size (int): Número de colunas de 'data' por bloco.
+
+    Retorna:
+        - DataFrame com uma linha por janela (rotulada pelo fim da janela, como em rolling())
+          e colunas (série de 'data', série de 'other').
+    """
+    data = as_frame(data)
+    other = as_frame(other).reindex(data.index)
+    if method == 'spearman':
+        data, other = rank_columns(data), rank_columns(other)
+    min_periods = window if min_periods is None else min_periods
+
+    x = (data - data.mean()).to_numpy()
+    y = (other - other.mean()).to_numpy()
+    mask_y = ~np.isnan(y)
+    y0 = np.where(mask_y, y, 0.0)
+    windows = np.arange(window - 1, len(x))
+
+    def window_sums(values):
+        # Soma de cada janela pela diferença das somas acumuladas (tempo, ...)
+        cumulative = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+        return cumulative[windows + 1] - cumulative[windows + 1 - window]
+
+    blocks = []
+    for start in range(0, x.shape[1], block_size):
+        xb = x[:, start:start + block_size]
+        mask_x = ~np.isnan(xb)
+        x0 = np.where(mask_x, xb, 0.0)
+        # Termos por instante e par (tempo, séries do bloco, referências), zerados onde falta um dos lados
+        pair = mask_x[:, :, None] & mask_y[:, None, :]
+        xp, yp = np.where(pair, x0[:, :, None], 0.0), np.where(pair, y0[:, None, :], 0.0)
+        sums = [window_sums(term) for term in (pair.astype(np.float64), xp, yp, xp * xp, yp * yp, xp * yp)]
+        blocks.append(correlation_from_sums(*sums, min_periods))
+
+    result = np.concatenate(blocks, axis=1).reshape(len(windows), -1)
+    columns = pd.MultiIndex.from_product([data.columns, other.columns])
+    return pd.DataFrame(result, index=data.index[windows], columns=columns)
+
+def top_k_view(correlation, k, reference=None):
+    """
+    Recorte da matriz de correlação com as 'k' séries mais correlacionadas (em valor absoluto)
+    com a série 'reference', ou, sem referência, com a maior correlação absoluta média.
+    Em uma matriz séries x referências, todas as colunas de referência são mantidas; em uma
+    matriz quadrada, a série 'reference' é mantida como primeira linha e coluna.
+
+    Parâmetros:
+        - correlation (DataFrame): Matriz de correlação (séries x séries ou séries x referências).
+        - k (int): Número de séries mantidas.
+        - reference (str): Coluna usada para ordenar as séries.
+    """
+    if reference is None:
+        strength = correlation.abs().mean(axis=1)
+    else:
+        strength = correlation[reference].abs().drop(index=[reference], errors='ignore')
+    selected = list(strength.nlargest(k).index)
+    if not correlation.index.equals(correlation.columns):
+        return correlation.loc[selected, :]
+    # Matriz quadrada: a referência entra como primeira linha e coluna
+    selected = ([reference] if reference is not None else []) + selected
+    return correlation.loc[selected, selected]
+
+def cluster_order(correlation):
+    """
+    Ordem das séries de uma matriz de correlação quadrada por agrupamento hierárquico
+    (distância 1 - |r|, ligação média), para que séries parecidas fiquem vizinhas no heatmap.
+    """
+    from scipy.cluster.hierarchy import linkage, leaves_list
+    from scipy.spatial.distance import squareform
+    if len(correlation) < 3:
+        return list(correlation.index)
+    distance = 1.0 - np.abs(np.nan_to_num(correlation.to_numpy()))
+    np.fill_diagonal(distance, 0.0)
+    distance = (distance + distance.T) / 2
+    order = leaves_list(linkage(squareform(distance, checks=False), method='average'))
+    return list(correlation.index[order])
+
+def clustered_view(correlation):
+    """
+    Matriz de correlação quadrada reordenada por cluster_order.
+    """
+    order = cluster_order(correlation)
+    return correlation.loc[order, order]
@@ -1,46 +1,474 @@
 # Importação dos módulos do usuário
-from config import PREDICTION, DEBUG_LEVEL
+from config import PREDICTION, STATION_PREDICTION, MODEL_CACHE, MODEL_DIR, MODEL_BACKEND, LOAD_EXECUTOR
+from config import VALIDATION_YEARS, EARLY_STOPPING_PATIENCE, LR_SCHEDULE, LR_PATIENCE, TRAIN_TIME_BUDGET
+from config import ENSEMBLE, ENSEMBLE_SIZE, INTERVAL_PERCENTILES
+from config import WARM_START, WARM_START_EPOCHS, WARM_START_COMPARE, FORECAST_HORIZON, FORECAST_SCENARIOS
 
 # Importação de outros módulos necessários
+import os
+import json
+import time
+import pickle
+import hashlib
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-from user_text_lib import secao, p
+from user_text_lib import secao, p, info
 from user_graph_lib import plot_line
+from user_load_lib import frame_hash, load_metro, load_population, load_pib, PIB_SERIES
+from user_table_lib import coalesce
+from user_instrument_lib import instrument_module
 
-def prediction(input_data, split_year, epocas, batch_size):
+# Arquitetura da rede neural: neurônios das camadas ocultas, dropout após a primeira
+# camada oculta e taxa de aprendizado do otimizador Adam
+HIDDEN_LAYERS = (64, 32)
+DROPOUT = 0.2
+LEARNING_RATE = 0.001
+
+def build_model(n_features, backend=MODEL_BACKEND):
     """
-    Função para prever dados futuros usando uma rede neural.
-    
+    Cria o modelo usado nas previsões, de acordo com o backend escolhido.
+
+    Parâmetros:
+        - n_features (int): Número de variáveis de entrada (e de saída).
+        - backend (str): "keras" (TensorFlow), "numpy" (mesma rede em NumPy) ou
+          "ridge" (regressão linear autorregressiva em forma fechada).
+
+    Retorna:
+        - Modelo com os métodos fit, predict, save_weights e load_weights.
+    """
+    if backend == 'numpy':
+        from user_model_lib import NumpyMLP
+        return NumpyMLP(n_features, HIDDEN_LAYERS, DROPOUT, LEARNING_RATE)
+    if backend == 'ridge':
+        from user_model_lib import RidgeAR
+        return RidgeAR(n_features)
+    if backend != 'keras':
+        raise ValueError(f"Backend de modelo desconhecido: {backend}")
+
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense, Input, Dropout
+    from tensorflow.keras.optimizers import Adam
+
+    # Configurar a estrutura da rede neural
+    model = Sequential([
+        Input(shape=(n_features,)),                    # Definir a camada de entrada
+        Dense(HIDDEN_LAYERS[0], activation='relu'),    # Primeira camada oculta
+        Dropout(DROPOUT),                              # Dropout para reduzir overfitting
+        Dense(HIDDEN_LAYERS[1], activation='relu'),    # Segunda camada oculta
+        Dense(n_features)                              # Camada de saída, um neurônio por variável (Passageiros, PIB e População)
+    ])
+
+    # Compilar o modelo com o otimizador Adam e uma taxa de aprendizado baixa
+    model.compile(optimizer=Adam(learning_rate=LEARNING_RATE), loss='mse')
+    return model
+
+def holdout_size(n_pairs):
+    """
+    Número de pares de anos separados para validação em fit_model: VALIDATION_YEARS,
+    ou 0 quando a validação ficaria com todos os pares de treino.
+    """
+    return VALIDATION_YEARS if n_pairs > VALIDATION_YEARS else 0
+
+def fit_model(model, X_train, y_train, epocas, batch_size, backend=MODEL_BACKEND, sample_weight=None):
+    """
+    Treina o modelo separando os últimos VALIDATION_YEARS pares de anos para validação,
+    com parada antecipada, ajuste da taxa de aprendizado e limite de tempo (TrainingController).
+    Se não sobrar nenhum par para o treino (janelas curtas), não há validação e a parada
+    antecipada acompanha a perda de treino.
+    O modelo "ridge" (forma fechada) é ajustado diretamente com todos os pares.
+
+    Parâmetros:
+        - model: Modelo criado por build_model.
+        - X_train, y_train (ndarray): Entradas (ano t) e saídas (ano t+1) normalizadas.
+        - epocas (int): Número máximo de épocas.
+        - batch_size (int): Tamanho do batch.
+        - backend (str): Backend do modelo ("keras", "numpy" ou "ridge").
+        - sample_weight (ndarray): Peso de cada par de treino, (pares,) ou (modelos, pares); somente NumPy.
+
+    Retorna:
+        - Resumo do treinamento (TrainingController.summary), ou None para o modelo "ridge".
+    """
+    if backend == 'ridge':
+        model.fit(X_train, y_train, epochs=epocas, batch_size=batch_size, verbose=0)
+        return None
+
+    from user_model_lib import TrainingController, keras_callback
+
+    controller = TrainingController(patience=EARLY_STOPPING_PATIENCE, lr_schedule=LR_SCHEDULE,
+                                    lr_patience=LR_PATIENCE, time_budget=TRAIN_TIME_BUDGET)
+    validation_data = None
+    validation_years = holdout_size(len(X_train))
+    if validation_years:
+        validation_data = (X_train[-validation_years:], y_train[-validation_years:])
+        X_train, y_train = X_train[:-validation_years], y_train[:-validation_years]
+        if sample_weight is not None:
+            sample_weight = sample_weight[..., :-validation_years]
+
+    if backend == 'keras':
+        model.fit(X_train, y_train, epochs=epocas, batch_size=batch_size, verbose=0,
+                  callbacks=[keras_callback(controller, validation_data)])
+    else:
+        model.fit(X_train, y_train, epochs=epocas, batch_size=batch_size, verbose=0,
+                  sample_weight=sample_weight, validation_data=validation_data, controller=controller)
+    return controller.summary()
+
+def ensemble_key(model_key, size=ENSEMBLE_SIZE):
+    """
+    Chave no cache do conjunto "bootstrap" associado ao modelo principal 'model_key'.
+    """
+    return hashlib.sha256(f"{model_key}-bootstrap-{size}".encode()).hexdigest()
+
+def forecast_samples(model, scaler, train_scaled, test_scaled, epocas, batch_size, model_key,
+                     method=ENSEMBLE, size=ENSEMBLE_SIZE, backend=MODEL_BACKEND, start_key=None, save=True):
+    """
+    Gera várias previsões do ano seguinte para cada ano de teste, usadas nos intervalos de previsão,
+    em uma única computação em lote (sem treinar 'size' modelos um após o outro).
+
+    Parâmetros:
+        - model: Modelo já treinado (usado no "mc_dropout").
+        - scaler (MinMaxScaler): Normalizador do modelo principal, guardado junto com o conjunto.
+        - train_scaled, test_scaled (ndarray): Anos de treino e de teste normalizados.
+        - epocas (int): Número máximo de épocas (usado no "bootstrap").
+        - batch_size (int): Tamanho do batch (usado no "bootstrap").
+        - model_key (str): Chave do modelo principal; o conjunto "bootstrap" é guardado no cache a partir dela.
+        - method (str): "bootstrap" = 'size' redes NumPy empilhadas (NumpyMLP com n_models), cada uma
+          treinada com uma reamostragem com reposição dos pares (t, t+1) de treino e com a sua
+          própria parada antecipada;
+          "mc_dropout" = 'size' passagens do modelo treinado com o dropout ativo.
+        - size (int): Número de redes ou de passagens.
+        - backend (str): Backend do modelo principal ("keras", "numpy" ou "ridge").
+        - start_key (str): Modelo de partida de um retreino incremental; o conjunto dele, se estiver no
+          cache, também parte dos pesos anteriores e faz apenas WARM_START_EPOCHS épocas.
+        - save (bool): Grava o conjunto treinado no cache.
+
+    Retorna:
+        - ndarray (size, anos de teste, variáveis) com as previsões normalizadas.
+    """
+    import numpy as np
+
+    if method == 'bootstrap':
+        from user_model_lib import NumpyMLP
+
+        X_train, y_train = train_scaled[:-1], train_scaled[1:]
+        ensemble = NumpyMLP(X_train.shape[1], HIDDEN_LAYERS, DROPOUT, LEARNING_RATE, n_models=size)
+        if load_trained_model(ensemble, ensemble_key(model_key, size)) is None:
+            # Retreino incremental: conjunto anterior adaptado ao novo normalizador
+            max_epochs = epocas
+            previous_scaler = load_trained_model(ensemble, ensemble_key(start_key, size)) if start_key else None
+            if previous_scaler is not None:
+                rescale_weights(ensemble, previous_scaler, scaler)
+                max_epochs = WARM_START_EPOCHS
+
+            # Peso de cada par = número de vezes em que foi sorteado na reamostragem daquela rede
+            rng = np.random.default_rng()
+            n_pairs = len(X_train) - holdout_size(len(X_train))
+            weights = np.ones((size, len(X_train)))
+            weights[:, :n_pairs] = rng.multinomial(n_pairs, np.full(n_pairs, 1 / n_pairs), size=size)
+            fit_model(ensemble, X_train, y_train, max_epochs, batch_size, 'numpy', sample_weight=weights)
+            if save:
+                save_trained_model(ensemble, scaler, ensemble_key(model_key, size))
+        return ensemble.predict(test_scaled)
+
+    if method == 'mc_dropout':
+        # Todas as passagens em uma só chamada: os anos de teste repetidos 'size' vezes,
+        # cada repetição com a sua própria máscara de dropout
+        if backend == 'keras':
+            repeated = np.tile(test_scaled, (size, 1))
+            return np.asarray(model(repeated, training=True)).reshape(size, *test_scaled.shape)
+        if backend == 'numpy':
+            return model.forward(np.broadcast_to(test_scaled, (size, *test_scaled.shape)), training=True)[0]
+        raise ValueError(f"O modelo {backend} não tem dropout para o método mc_dropout")
+
+    raise ValueError(f"Método de intervalo de previsão desconhecido: {method}")
+
+def model_fingerprint(train_data, backend=MODEL_BACKEND, **params):
+    """
+    Calcula a chave de um modelo treinado a partir dos dados de treino, dos hiperparâmetros,
+    da arquitetura da rede e do backend (incluindo a versão da biblioteca usada).
+
+    Parâmetros:
+        - train_data (DataFrame): Dados usados no treinamento.
+        - backend (str): Backend do modelo ("keras", "numpy" ou "ridge").
+        - params: Hiperparâmetros do treinamento (ex.: split_year, epocas, batch_size).
+
+    Retorna:
+        - str: Hash hexadecimal que identifica o modelo.
+    """
+    description = {
+        'data': frame_hash(train_data),
+        'params': params,
+        **training_description(backend),
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+
+def training_description(backend=MODEL_BACKEND):
+    """
+    Configurações que definem como um modelo é treinado, além dos dados e da janela:
+    arquitetura da rede, parada antecipada e agenda da taxa de aprendizado, e o backend
+    (incluindo a versão da biblioteca usada).
+    """
+    if backend == 'keras':
+        import keras as library
+    else:
+        import numpy as library
+
+    return {
+        'architecture': [HIDDEN_LAYERS, DROPOUT, LEARNING_RATE],
+        'training': [VALIDATION_YEARS, EARLY_STOPPING_PATIENCE, LR_SCHEDULE, LR_PATIENCE, TRAIN_TIME_BUDGET],
+        'backend': [backend, library.__version__],
+    }
+
+def load_trained_model(model, model_key):
+    """
+    Carrega do cache os pesos e o MinMaxScaler de um modelo já treinado.
+
+    Parâmetros:
+        - model: Modelo com a mesma arquitetura, que recebe os pesos.
+        - model_key (str): Chave calculada por model_fingerprint.
+
+    Retorna:
+        - O MinMaxScaler ajustado, ou None se o modelo não estiver no cache.
+    """
+    path = os.path.join(MODEL_DIR, model_key)
+    weights_path = path + getattr(model, 'weights_suffix', ".weights.h5")
+    if not (MODEL_CACHE and os.path.exists(weights_path) and os.path.exists(path + ".scaler.pkl")):
+        return None
+    model.load_weights(weights_path)
+    with open(path + ".scaler.pkl", 'rb') as file:
+        return pickle.load(file)
+
+def save_trained_model(model, scaler, model_key):
+    """
+    Grava no cache os pesos e o MinMaxScaler de um modelo treinado.
+
+    Parâmetros:
+        - model: Modelo treinado.
+        - scaler (MinMaxScaler): Normalizador ajustado nos dados de treino.
+        - model_key (str): Chave calculada por model_fingerprint.
+    """
+    if MODEL_CACHE:
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        path = os.path.join(MODEL_DIR, model_key)
+        model.save_weights(path + getattr(model, 'weights_suffix', ".weights.h5"))
+        with open(path + ".scaler.pkl", 'wb') as file:
+            pickle.dump(scaler, file)
+
+def latest_model_path(train_data, batch_size, backend=MODEL_BACKEND):
+    """
+    Caminho do registro do último modelo treinado (ou carregado) com as mesmas variáveis,
+    batch size e configurações de treino (training_description); só a janela de anos pode mudar.
+    Cada combinação tem o seu próprio registro, então treinos com outras configurações não o substituem.
+    """
+    description = {'columns': list(train_data.columns), 'batch_size': batch_size, **training_description(backend)}
+    key = hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+    return os.path.join(MODEL_DIR, f"latest-{backend}-{key[:16]}.json")
+
+def remember_model(model_key, train_data, batch_size, backend=MODEL_BACKEND, start_key=None):
+    """
+    Registra o modelo como o último usado, ponto de partida do próximo retreino incremental.
+    O arquivo é substituído de forma atômica, para que uma leitura nunca encontre um registro incompleto.
+
+    Parâmetros:
+        - model_key (str): Chave do modelo no cache.
+        - train_data (DataFrame): Dados usados no treinamento.
+        - batch_size (int): Tamanho do batch usado no treinamento.
+        - backend (str): Backend do modelo.
+        - start_key (str): Modelo de partida do ajuste fino que gerou 'model_key' (None = treino do zero).
+    """
+    if MODEL_CACHE:
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        path = latest_model_path(train_data, batch_size, backend)
+        with open(f"{path}.{os.getpid()}.tmp", 'w') as file:
+            json.dump({'key': model_key, 'train_end': int(train_data.index.max()), 'start': start_key}, file)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+def previous_model(train_data, batch_size, backend=MODEL_BACKEND):
+    """
+    Procura o ponto de partida de um ajuste fino: o último modelo registrado com as mesmas variáveis,
+    batch size e configurações de treino, se a janela dele termina antes do fim da atual.
+    Se o registro já é desta janela, devolve o mesmo ponto de partida usado por ele, para que
+    a mesma chamada chegue à mesma chave e encontre o ajuste fino no cache em vez de retreinar.
+
+    Retorna:
+        - Chave do modelo no cache, ou None se não houver um modelo compatível
+          (ou se o modelo registrado desta janela foi treinado do zero).
+    """
+    path = latest_model_path(train_data, batch_size, backend)
+    if backend == 'ridge' or not (MODEL_CACHE and os.path.exists(path)):
+        return None
+    with open(path) as file:
+        description = json.load(file)
+    if description['train_end'] < train_data.index.max():
+        return description['key']
+    if description['train_end'] == train_data.index.max():
+        return description.get('start')
+    return None
+
+def rescale_weights(model, old_scaler, new_scaler):
+    """
+    Ajusta os pesos de entrada e de saída da rede para um novo MinMaxScaler, de modo que
+    a rede calcule exatamente a mesma função nos dados originais: com x' = a * x + b
+    (normalização nova em função da antiga), a primeira camada passa a receber x' e a
+    última a produzir a saída já na escala nova.
+
+    Parâmetros:
+        - model: Rede com get_weights/set_weights (Keras ou NumpyMLP), pesos na ordem kernel, bias.
+        - old_scaler (MinMaxScaler): Normalizador com que a rede foi treinada.
+        - new_scaler (MinMaxScaler): Normalizador ajustado na janela de treino atual.
+    """
+    a = new_scaler.scale_ / old_scaler.scale_
+    b = new_scaler.min_ - old_scaler.min_ * a
+
+    weights = model.get_weights()
+    # O reshape mantém o formato do bias também nas redes empilhadas do NumpyMLP (modelos, 1, saídas)
+    weights[1] = weights[1] - ((b / a) @ weights[0]).reshape(weights[1].shape)
+    weights[0] = weights[0] / a[:, None]
+    weights[-2] = weights[-2] * a
+    weights[-1] = weights[-1] * a + b
+    model.set_weights(weights)
+
+def rollout(model, starts, horizon, backend=MODEL_BACKEND):
+    """
+    Previsão recursiva de vários passos: a saída do ano t é a entrada do ano t+1.
+    Todos os pontos de partida (cenários) avançam juntos, com uma única chamada ao modelo
+    por ano, em vez de uma chamada por ano e por cenário.
+
+    Parâmetros:
+        - model: Modelo treinado (ano t -> ano t+1, valores normalizados).
+        - starts (ndarray): Pontos de partida normalizados, (cenários, variáveis).
+        - horizon (int): Número de anos à frente.
+        - backend (str): Backend do modelo; no Keras, predict_on_batch evita o custo fixo do predict.
+
+    Retorna:
+        - ndarray (horizon, cenários, variáveis) com as previsões normalizadas de cada ano.
+    """
+    import numpy as np
+
+    steps = []
+    current = np.asarray(starts, dtype='float32' if backend == 'keras' else float)
+    for _ in range(horizon):
+        current = np.asarray(model.predict_on_batch(current) if backend == 'keras' else model.predict(current))
+        steps.append(current)
+    return np.stack(steps)
+
+def forecast_scenarios(model, scaler, last_values, horizon=FORECAST_HORIZON, scenarios=FORECAST_SCENARIOS, backend=MODEL_BACKEND):
+    """
+    Previsão dos próximos 'horizon' anos para o cenário "Base" (último ano observado) e para
+    cada cenário de 'scenarios' (fatores aplicados às variáveis do último ano), em um único rollout.
+
+    Parâmetros:
+        - model: Modelo treinado.
+        - scaler (MinMaxScaler): Normalizador do modelo.
+        - last_values (Series): Valores do último ano observado (o nome da Series é o ano).
+        - horizon (int): Número de anos à frente.
+        - scenarios (dict): Nome do cenário -> {variável: fator}.
+        - backend (str): Backend do modelo.
+
+    Retorna:
+        - dict variável -> DataFrame com uma coluna por cenário e uma linha por ano, começando
+          no último ano observado (para ligar as linhas do gráfico aos dados), pronto para plot_line.
+    """
+    starts = {"Base": last_values}
+    for name, factors in (scenarios or {}).items():
+        starts[name] = last_values * pd.Series(factors).reindex(last_values.index).fillna(1.0)
+    starts = pd.DataFrame(starts).T
+
+    steps = rollout(model, scaler.transform(starts), horizon, backend)
+    years = range(int(last_values.name), int(last_values.name) + horizon + 1)
+
+    frames = {}
+    for position, var in enumerate(last_values.index):
+        values = [starts[var].to_numpy()] + [scaler.inverse_transform(step)[:, position] for step in steps]
+        frames[var] = pd.DataFrame(values, index=years, columns=starts.index)
+    return frames
+
+def train_and_predict(input_data, split_year, epocas, batch_size, backend=MODEL_BACKEND, warm_start=WARM_START,
+                      remember=True, save=True):
+    """
+    Treina a rede neural (ou carrega do cache) com os anos até 'split_year'
+    e faz a previsão para os anos seguintes, sem gerar gráficos.
+
     Parâmetros:
         - input_data (DataFrame): Dados de entrada para a previsão.
         - split_year (int): Ano para divisão entre dados de treino e teste.
         - epocas (int): Número de épocas para o treinamento.
         - batch_size (int): Tamanho do batch para o treinamento.
+        - backend (str): Backend do modelo ("keras", "numpy" ou "ridge").
+        - warm_start (bool): Sem um modelo no cache para estes dados, parte do último modelo treinado
+          (previous_model), com os pesos ajustados ao novo normalizador (rescale_weights),
+          e treina apenas WARM_START_EPOCHS épocas.
+        - remember (bool): Registra o modelo como ponto de partida do próximo retreino incremental
+          (remember_model); desligado na varredura e na comparação de compare_warm_start.
+        - save (bool): Grava o modelo treinado (e o conjunto das faixas de previsão) no cache;
+          desligado no retreino completo de compare_warm_start, que não deve substituir o modelo da previsão.
+
+    Retorna:
+        - dict com:
+            - 'combined' (DataFrame): Dados de entrada e colunas '*_Previsto' para os anos de teste.
+            - 'test_mse' (float): Erro quadrático médio, na escala normalizada, da previsão
+              um ano à frente nos anos de teste (mesmo critério da função de perda do treino).
+            - 'train_time' (float): Tempo de treinamento, em segundos (0 se o modelo veio do cache).
+            - 'ensemble_time' (float): Tempo das faixas de previsão (treino do conjunto ou passagens
+              com dropout), em segundos, medido à parte de 'train_time'.
+            - 'cached' (bool): Se o modelo foi carregado do cache.
+            - 'warm_start' (str): Chave do modelo de partida do ajuste fino (None = treino do zero).
+            - 'training' (dict): Resumo do treinamento com o histórico de perdas por época
+              (ver fit_model; None se o modelo veio do cache ou é o "ridge").
+            - 'intervals' (dict): Variável -> (coluna do percentil inferior, coluna do superior)
+              incluídas em 'combined' (vazio quando ENSEMBLE é None).
+            - 'forecast' (dict): Previsão dos FORECAST_HORIZON anos seguintes ao último ano com dados,
+              por cenário (ver forecast_scenarios).
     """
-    if PREDICTION:
-        secao(f"REDE NEURAL -- Ano de divisão: {split_year} | Épocas: {epocas} | Batch Size: {batch_size}")
+    import time
+    from sklearn.preprocessing import MinMaxScaler
 
-        from tensorflow.keras.models import Sequential
-        from tensorflow.keras.layers import Dense, Input, Dropout
-        from tensorflow.keras.optimizers import Adam
+    # Limpar dados, removendo linhas com valores NaN (sem alterar o DataFrame recebido,
+    # que o pipeline compartilha com as outras etapas que usam o mesmo resultado)
+    input_data = input_data.dropna()
 
-        # Limpar dados, removendo linhas com valores NaN
-        input_data.dropna(inplace=True)
+    # Dividir dados entre treino e teste com base no ano definido
+    train_data = input_data[input_data.index <= split_year]
+    test_data = input_data[input_data.index > split_year]
 
-        # Dividir dados entre treino e teste com base no ano definido
-        train_data = input_data[input_data.index <= split_year]
-        test_data = input_data[input_data.index > split_year]
+    # Exibir conjuntos de treino e teste
+    p("\nTreinamento:")
+    p(train_data)
+    p("\nTeste:")
+    p(test_data)
 
-        # Exibir conjuntos de treino e teste
-        p("\nTreinamento:")
-        p(train_data)
-        p("\nTeste:")
-        p(test_data)
+    # Criar a rede neural e procurar no cache um modelo já treinado
+    # com os mesmos dados de treino, hiperparâmetros e arquitetura
+    model = build_model(train_data.shape[1], backend)
+    model_key = model_fingerprint(train_data, backend, split_year=split_year, epocas=epocas, batch_size=batch_size)
+    scaler = load_trained_model(model, model_key)
+    cached = scaler is not None
+    train_time = 0.0
+    training = None
 
+    # Retreino incremental: o ajuste fino a partir de um modelo anterior tem a sua própria chave
+    start_key = previous_model(train_data, batch_size, backend) if warm_start and not cached else None
+    if start_key is not None:
+        model_key = model_fingerprint(train_data, backend, split_year=split_year, epocas=WARM_START_EPOCHS,
+                                      batch_size=batch_size, warm_start=start_key)
+        scaler = load_trained_model(model, model_key)
+        cached = scaler is not None
+        if not cached:
+            # Pesos e normalizador do modelo de partida (None se os arquivos não existirem mais)
+            previous_scaler = load_trained_model(model, start_key)
+            if previous_scaler is None:
+                start_key = None
+                model_key = model_fingerprint(train_data, backend, split_year=split_year, epocas=epocas, batch_size=batch_size)
+
+    if cached:
+        p("\nModelo já treinado carregado do cache: " + model_key)
+    else:
         # Normalizar os dados usando Min-Max
         scaler = MinMaxScaler()
         train_scaled = scaler.fit_transform(train_data)
-        test_scaled = scaler.transform(test_data)
+
+        # A faixa dos dados muda com os novos anos: adaptar os pesos de partida ao novo normalizador
+        if start_key is not None:
+            rescale_weights(model, previous_scaler, scaler)
+            p(f"\nAjuste fino de {WARM_START_EPOCHS} épocas a partir do modelo anterior: {start_key}")
 
         # Preparar entradas (X) e saídas (y) para o treinamento
         X_train, y_train = train_scaled[:-1], train_scaled[1:]
@@ -50,78 +478,297 @@ def prediction(input_data, split_year, epocas, batch_size):
         p("Saídas de Treinamento (y_train):")
         p(y_train)
 
-        # Configurar a estrutura da rede neural
-        model = Sequential([
-            Input(shape=(X_train.shape[1],)),  # Definir a camada de entrada
-            Dense(64, activation='relu'),      # Primeira camada oculta
-            Dropout(0.2),                      # Dropout para reduzir overfitting
-            Dense(32, activation='relu'),      # Segunda camada oculta
-            Dense(3)                           # Camada de saída com 3 neurônios para Passageiros, PIB e População
-        ])
-
-        # Compilar o modelo com o otimizador Adam e uma taxa de aprendizado baixa
-        model.compile(optimizer=Adam(learning_rate=0.001), loss='mse')
-
         # Treinar o modelo com os dados de treino
         p("\nIniciando o treinamento do modelo...")
-        model.fit(X_train, y_train, epochs=epocas, batch_size=batch_size, verbose=0)
+        start = time.perf_counter()
+        max_epochs = epocas if start_key is None else WARM_START_EPOCHS
+        training = fit_model(model, X_train, y_train, max_epochs, batch_size, backend)
+        train_time = time.perf_counter() - start
+        if save:
+            save_trained_model(model, scaler, model_key)
+
+        if training is not None:
+            p(f"\nÉpocas executadas: {training['epochs_run']} de {max_epochs} | Melhor época: {training['best_epoch'] + 1}"
+              f" | Perda monitorada: {training['best_loss']:.6f} | Tempo: {train_time:.1f}s")
+
+    # Ponto de partida do próximo retreino incremental
+    if remember:
+        remember_model(model_key, train_data, batch_size, backend, start_key)
+
+    test_scaled = scaler.transform(test_data)
+
+    # Fazer previsões e desnormalizar os resultados
+    predictions_scaled = model.predict(test_scaled, verbose=0)
+    predictions = scaler.inverse_transform(predictions_scaled)
+
+    p("\nPrevisões Desnormalizadas (predictions):")
+    p(predictions)
+
+    # Obter os valores reais para comparação
+    actual_values = test_data.values
+    p("\nValores Reais (actual_values):")
+    p(actual_values)
+
+    # A previsão feita a partir do ano t corresponde ao ano t+1
+    test_mse = float(((predictions_scaled[:-1] - test_scaled[1:]) ** 2).mean())
+
+    # Criar um DataFrame consolidado para plotar dados reais e previstos
+    def preparar_dados_plot_line(input_data, test_data, predictions):
+        years_test = test_data.index
+        predictions_df = pd.DataFrame(predictions, index=years_test, columns=['Passageiros_Previsto', 'PIB_Previsto', 'População_Previsto'])
+        combined_consolidado = pd.concat([input_data, predictions_df], axis=1)
+        return combined_consolidado
+
+    # Consolidar dados
+    combined_consolidado = preparar_dados_plot_line(input_data, test_data, predictions)
 
-        # Fazer previsões e desnormalizar os resultados
-        predictions_scaled = model.predict(test_scaled)
-        predictions = scaler.inverse_transform(predictions_scaled)
+    # Faixas de previsão: percentis das previsões do conjunto, ao lado de cada coluna '*_Previsto'
+    # (o MinMaxScaler é crescente em cada variável, então os percentis podem ser desnormalizados diretamente)
+    intervals = {}
+    ensemble_time = 0.0
+    if ENSEMBLE is not None:
+        import numpy as np
 
-        p("\nPrevisões Desnormalizadas (predictions):")
-        p(predictions)
+        start = time.perf_counter()
+        samples = forecast_samples(model, scaler, scaler.transform(train_data), test_scaled, epocas, batch_size, model_key,
+                                   backend=backend, start_key=start_key, save=save)
+        ensemble_time = time.perf_counter() - start
+        for percentile, band in zip(INTERVAL_PERCENTILES, np.percentile(samples, INTERVAL_PERCENTILES, axis=0)):
+            band = pd.DataFrame(scaler.inverse_transform(band), index=test_data.index, columns=test_data.columns)
+            for var in test_data.columns:
+                combined_consolidado[f"{var}_Previsto_P{percentile}"] = band[var]
+        intervals = {var: tuple(f"{var}_Previsto_P{percentile}" for percentile in INTERVAL_PERCENTILES) for var in test_data.columns}
 
-        # Obter os valores reais para comparação
-        actual_values = test_data.values
-        p("\nValores Reais (actual_values):")
-        p(actual_values)
+        p(f"\nFaixas de previsão ({ENSEMBLE}, {ENSEMBLE_SIZE} amostras, percentis {INTERVAL_PERCENTILES}):")
+        p(combined_consolidado.loc[test_data.index, [column for bounds in intervals.values() for column in bounds]])
 
-        # Criar um DataFrame consolidado para plotar dados reais e previstos
-        def preparar_dados_plot_line(input_data, test_data, predictions):
-            years_test = test_data.index
-            predictions_df = pd.DataFrame(predictions, index=years_test, columns=['Passageiros_Previsto', 'PIB_Previsto', 'População_Previsto'])
-            combined_consolidado = pd.concat([input_data, predictions_df], axis=1)
-            return combined_consolidado
+    # Previsão além dos dados: a partir do último ano observado, para os anos ainda sem dados
+    forecast = forecast_scenarios(model, scaler, input_data.iloc[-1], backend=backend)
+    p(f"\nPrevisão para os próximos {FORECAST_HORIZON} anos (cenários: {', '.join(forecast[input_data.columns[0]].columns)}):")
+    p(lambda: pd.concat(forecast, axis=1))
 
-        # Consolidar dados
-        combined_consolidado = preparar_dados_plot_line(input_data, test_data, predictions)
+    return {
+        'combined': combined_consolidado,
+        'test_mse': test_mse,
+        'train_time': train_time,
+        'ensemble_time': ensemble_time,
+        'cached': cached,
+        'warm_start': start_key,
+        'training': training,
+        'intervals': intervals,
+        'forecast': forecast,
+    }
+
+def compare_warm_start(input_data, split_year, epocas, batch_size, backend=MODEL_BACKEND):
+    """
+    Compara o retreino incremental (ajuste fino a partir do último modelo registrado) com um retreino
+    completo nos mesmos dados. O ajuste fino fica no cache (é o mesmo que a previsão com WARM_START carrega);
+    o retreino completo não é gravado e nenhum dos dois altera o registro do último modelo,
+    então a comparação não muda o modelo usado pela previsão.
+
+    Parâmetros:
+        - input_data (DataFrame): Dados de entrada para a previsão.
+        - split_year (int): Ano para divisão entre dados de treino e teste.
+        - epocas (int): Número de épocas do retreino completo.
+        - batch_size (int): Tamanho do batch para o treinamento.
+        - backend (str): Backend do modelo ("keras" ou "numpy").
+
+    Retorna:
+        - DataFrame com uma linha por modo ('incremental' e 'completo') e as colunas 'test_mse',
+          'train_time', 'ensemble_time', 'epochs_run', 'cached' e 'warm_start'.
+    """
+    rows = {}
+    for mode, warm_start in (('incremental', True), ('completo', False)):
+        result = train_and_predict(input_data, split_year, epocas, batch_size, backend, warm_start=warm_start,
+                                   remember=False, save=warm_start)
+        rows[mode] = {
+            'test_mse': result['test_mse'],
+            'train_time': result['train_time'],
+            'ensemble_time': result['ensemble_time'],
+            'epochs_run': result['training']['epochs_run'] if result['training'] else None,
+            'cached': result['cached'],
+            'warm_start': result['warm_start'],
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+def prediction(input_data, split_year, epocas, batch_size):
+    """
+    Função para prever dados futuros usando uma rede neural.
+    
+    Parâmetros:
+        - input_data (DataFrame): Dados de entrada para a previsão.
+        - split_year (int): Ano para divisão entre dados de treino e teste.
+        - epocas (int): Número de épocas para o treinamento.
+        - batch_size (int): Tamanho do batch para o treinamento.
+
+    Retorna:
+        - O resultado de train_and_predict, ou None se PREDICTION estiver desabilitado.
+    """
+    if PREDICTION:
+        secao(f"REDE NEURAL -- Ano de divisão: {split_year} | Épocas: {epocas} | Batch Size: {batch_size} | Backend: {MODEL_BACKEND}")
+
+        # Comparação do retreino incremental com o completo (antes da previsão, que parte do mesmo modelo anterior:
+        # a comparação não grava o modelo completo nem altera o registro do último modelo)
+        if WARM_START_COMPARE:
+            secao("Retreino incremental x retreino completo")
+            p(compare_warm_start(input_data, split_year, epocas, batch_size))
+
+        result = train_and_predict(input_data, split_year, epocas, batch_size)
+        combined_consolidado = result['combined']
 
         # Gerar gráficos comparativos para cada variável
         variables = ['Passageiros', 'PIB', 'População']
         for var in variables:
-            data_plot = combined_consolidado[[var, f"{var}_Previsto"]]
+            bands = {}
+            if var in result['intervals']:
+                low, high = result['intervals'][var]
+                bands = {f"Faixa {INTERVAL_PERCENTILES[0]}%-{INTERVAL_PERCENTILES[1]}%": (low, high)}
+            data_plot = combined_consolidado[[var, f"{var}_Previsto", *[column for bounds in bands.values() for column in bounds]]]
             title = f"Previsão Rede Neural - {var} - (Epocas {epocas} - Batch {batch_size})"
-            plot_line(data_plot, x_label="Ano", y_label=var, title=title)
+            plot_line(data_plot, x_label="Ano", y_label=var, title=title, bands=bands)
+
+            # Anos futuros: dados observados seguidos da previsão de cada cenário
+            future = pd.concat([combined_consolidado[[var]].dropna(), result['forecast'][var].add_prefix(f"{var}_Previsto - ")], axis=1)
+            plot_line(future, x_label="Ano", y_label=var, title=f"Previsão Rede Neural - {var} - Próximos {FORECAST_HORIZON} Anos por Cenário")
+
+        # Curvas de perda por época (somente quando o modelo foi treinado nesta execução)
+        if result['training'] is not None:
+            history = pd.DataFrame(result['training']['history'])[['loss', 'val_loss']].astype(float)
+            history.index = history.index + 1
+            plot_line(history.rename(columns={'loss': 'Treino', 'val_loss': 'Validação'}).dropna(axis=1, how='all'),
+                      x_label="Época", y_label="MSE", title=f"Perda por Época - Rede Neural - (Batch {batch_size})")
+
+        return result
+
+def station_prediction(metro_matrix, split_year, epocas, batch_size):
+    """
+    Previsão de passageiros por estação: uma rede neural por estação (passageiros do ano t
+    para o ano t+1), todas treinadas juntas em uma única computação em lote, com os pesos
+    empilhados no eixo das estações (NumpyMLP com n_models). Usa sempre o backend NumPy.
+
+    Parâmetros:
+        - metro_matrix (MetroMatrix): Dados do metrô já limpos, na matriz estação x mês.
+        - split_year (int): Último ano usado no treinamento.
+        - epocas (int): Número de épocas para o treinamento.
+        - batch_size (int): Tamanho do batch (em pares de anos) para o treinamento.
+
+    Retorna:
+        - DataFrame com as colunas 'Station', 'year', 'passengers' (real) e 'passengers_Previsto',
+          com a previsão um ano à frente para cada ano após 'split_year' (e para o ano seguinte
+          ao último dado), ou None se a previsão por estação estiver desabilitada.
+    """
+    if not (PREDICTION and STATION_PREDICTION):
+        return None
+
+    import numpy as np
+    from user_model_lib import NumpyMLP
+
+    secao(f"PREVISÃO POR ESTAÇÃO -- Ano de divisão: {split_year} | Épocas: {epocas} | Batch Size: {batch_size}")
+
+    # Matriz estação x ano com o total anual de passageiros (NaN nos anos sem registros)
+    series = metro_matrix.yearly_by_station()
+    train_columns = series.columns <= split_year
+
+    # Normalizar cada estação com o mínimo e o máximo dos seus anos de treino
+    low = series.loc[:, train_columns].min(axis=1).to_numpy()[:, None]
+    high = series.loc[:, train_columns].max(axis=1).to_numpy()[:, None]
+    scale = np.where(high > low, high - low, 1.0)
+    scaled = (series.to_numpy() - low) / scale
+
+    # Pares (t, t+1) de treino; pares com anos sem dados recebem peso zero
+    X_train, y_train = scaled[:, train_columns][:, :-1], scaled[:, train_columns][:, 1:]
+    weights = ~(np.isnan(X_train) | np.isnan(y_train))
+    trained = weights.any(axis=1)
+    p(f"\nTreinando {trained.sum()} estações em lote ({(~trained).sum()} sem dados de treino suficientes)")
+
+    model = NumpyMLP(1, HIDDEN_LAYERS, DROPOUT, LEARNING_RATE, n_models=len(series))
+    model.fit(np.nan_to_num(X_train)[..., None], np.nan_to_num(y_train)[..., None], epochs=epocas,
+              batch_size=batch_size, sample_weight=weights)
+
+    # Prever o ano seguinte a partir de cada ano após o corte
+    test_years = series.columns[series.columns >= split_year]
+    inputs = scaled[:, series.columns >= split_year]
+    forecast = model.predict(np.nan_to_num(inputs)[..., None])[..., 0] * scale + low
+    forecast[np.isnan(inputs) | ~trained[:, None]] = np.nan
+
+    # Montar o resultado no formato longo, uma linha por estação e ano previsto
+    target_years = test_years + 1
+    result = pd.DataFrame({
+        'Station': series.index.repeat(len(target_years)),
+        'year': np.tile(target_years, len(series)),
+        'passengers': series.reindex(columns=target_years).to_numpy().ravel(),
+        'passengers_Previsto': forecast.ravel(),
+    })
+
+    p(result)
+    return result
 
 def data_profile(data):
     """
     Função para exibir um perfil detalhado dos dados para análise exploratória.
+    Só é calculado quando o DEBUG_LEVEL é 3.
     
     Parâmetros:
         - data (DataFrame): Dados a serem analisados.
     """
-    if DEBUG_LEVEL == 3:
-        pd.set_option('display.max_rows', None)
-        pd.set_option('display.max_columns', None)
-        secao("Data profiling")
+    secao("Data profiling", level=3)
+
+    # Exibir informações sobre a estrutura dos dados
+    p("Estrutura dos dados", level=3)
+    p(lambda: info(data), level=3)
+
+    # Mostrar as primeiras linhas dos dados
+    p("\nPrimeiras linhas dos dados", level=3)
+    p(data.head, level=3)
+
+    # Verificar a presença de valores nulos
+    p("\nValores faltantes em cada coluna", level=3)
+    p(lambda: data.isnull().sum(), level=3)
+
+    # Exibir a descrição estatística dos dados
+    p("\nDescrição estatística dos dados", level=3)
+    p(lambda: data.describe(include='all'), level=3)
+
+def missing_report(metro_data, value_column='passengers'):
+    """
+    Calcula o relatório de dados faltantes de passageiros por estação, por mês e por linha.
 
-        # Exibir informações sobre a estrutura dos dados
-        p("Estrutura dos dados")
-        p(data.info())
+    Os registros são agregados uma única vez por estação, linha e mês; os demais níveis
+    são obtidos somando esse resultado intermediário, sem funções Python por grupo.
 
-        # Mostrar as primeiras linhas dos dados
-        p("\nPrimeiras linhas dos dados")
-        p(data.head())
+    Parâmetros:
+        - metro_data (DataFrame): Dados do metrô, com colunas 'Station', 'subway_line' e 'year_month'.
+        - value_column (str): Coluna cujos valores ausentes serão contados.
+
+    Retorna:
+        - dict com os DataFrames 'station', 'month' e 'line' (colunas 'missing_count',
+          'total_count' e 'missing_percentage'; 'month' inclui também 'total_stations')
+          e a Series 'total' com os mesmos indicadores para o conjunto completo.
+    """
+    keys = ['Station', 'subway_line', 'year_month']
+    cells = (metro_data[value_column].isna()
+             .groupby([metro_data[key] for key in keys], observed=True)
+             .agg(['sum', 'size']))
+    cells.columns = ['missing_count', 'total_count']
+
+    def summarize(level):
+        summary = cells.groupby(level=level, observed=True).sum()
+        summary['missing_percentage'] = (summary['missing_count'] / summary['total_count']) * 100
+        return summary
 
-        # Verificar a presença de valores nulos
-        p("\nValores faltantes em cada coluna")
-        p(data.isnull().sum())
+    by_month = summarize('year_month')
+    stations = cells.index.droplevel('subway_line').unique()
+    by_month.insert(2, 'total_stations', stations.get_level_values('year_month').value_counts().reindex(by_month.index))
 
-        # Exibir a descrição estatística dos dados
-        p("\nDescrição estatística dos dados")
-        p(data.describe(include='all'))
+    total = cells.sum()
+    total['missing_percentage'] = (total['missing_count'] / total['total_count']) * 100
+
+    return {
+        'station': summarize('Station').reset_index(),
+        'month': by_month.reset_index(),
+        'line': summarize('subway_line').reset_index(),
+        'total': total,
+    }
 
 def analyse_pax(metro_data):
     """
@@ -129,7 +776,7 @@ def analyse_pax(metro_data):
     calculando a porcentagem de valores ausentes.
 
     Parâmetros:
-        - metro_data (DataFrame): DataFrame contendo os dados do metrô, incluindo colunas 'Station' e 'passengers'.
+        - metro_data (DataFrame): DataFrame contendo os dados do metrô, incluindo colunas 'Station', 'subway_line', 'year_month' e 'passengers'.
     
     Esta função exibe:
         - O total de valores ausentes ('missing_count') de passageiros por estação.
@@ -138,15 +785,167 @@ def analyse_pax(metro_data):
     """
     secao("Análise passageiros x estação")
     
-    # Contar o número de valores ausentes em 'passengers' por estação
-    missing_pax_by_station = metro_data.groupby('Station')['passengers'].apply(lambda x: x.isnull().sum()).reset_index(name='missing_count')
-    
-    # Adicionar a contagem total de registros por estação
-    missing_pax_by_station['total_count'] = metro_data.groupby('Station')['passengers'].size().values
-    
-    # Calcular a porcentagem de valores ausentes por estação
-    missing_pax_by_station['missing_percentage'] = (missing_pax_by_station['missing_count'] / missing_pax_by_station['total_count']) * 100
-    
     # Exibir estações com valores ausentes, ordenando pela maior porcentagem de faltantes
-    p(missing_pax_by_station[missing_pax_by_station['missing_count'] > 0].sort_values(by='missing_percentage', ascending=False))
+    # (o relatório só é calculado se for exibido)
+    def missing_stations():
+        missing_pax_by_station = missing_report(metro_data)['station']
+        return missing_pax_by_station[missing_pax_by_station['missing_count'] > 0].sort_values(by='missing_percentage', ascending=False)
+
+    p(missing_stations)
+
+def remove_leading_nan(metro_data, group_column='Station', value_column='passengers', order_column='year_month'):
+    """
+    Remove, para cada estação, os registros iniciais sem valor de passageiros
+    (do início da série até o primeiro valor válido), em uma única passada vetorizada.
+
+    Parâmetros:
+        - metro_data (DataFrame): DataFrame com os dados do metrô.
+        - group_column (str): Coluna que identifica cada série (estação).
+        - value_column (str): Coluna com os valores a verificar.
+        - order_column (str): Coluna que define a ordem temporal dentro de cada série.
+
+    Retorna:
+        - DataFrame ordenado por série e data, com índice sequencial e sem os registros
+          iniciais vazios de cada série. Séries sem nenhum valor válido são descartadas.
+    """
+    data = metro_data.sort_values(by=[group_column, order_column]).reset_index(drop=True)
+
+    # Máscara cumulativa "já apareceu um valor válido" dentro de cada série
+    seen_valid = data[value_column].notna().groupby(data[group_column], observed=True, sort=False).cummax()
+
+    return data[seen_valid].reset_index(drop=True)
+
+def fix_subway_line(metro_data):
+    """
+    Corrige os nomes das linhas do metrô com espaços duplos ("Linha  1" é a mesma linha que "Linha 1").
+
+    Parâmetros:
+        - metro_data (DataFrame): DataFrame com os dados do metrô.
+    """
+    metro_data = metro_data.copy()
+    metro_data['subway_line'] = metro_data['subway_line'].str.replace('  ', ' ', regex=False).astype('category')
+    return metro_data
+
+def interpolate_population(population_data):
+    """
+    Ordena os dados de população por ano e estima os anos sem informação por interpolação linear.
+
+    Parâmetros:
+        - population_data (DataFrame): DataFrame com as colunas 'Ano' e 'População'.
+    """
+    population_data = population_data.sort_values(by="Ano").reset_index(drop=True)
+    population_data['População'] = population_data['População'].interpolate(method='linear')
+    return population_data
+
+def unify_pib(pib):
+    """
+    Cria a série 'Unificado' do PIB a partir das três séries do IBGE:
+    1.1 (Revisado) tem prioridade sobre 1.2 (Retropolado), que tem prioridade sobre 1.3 (Encerrado).
+
+    Parâmetros:
+        - pib (DataFrame): DataFrame com as colunas 'Revisado', 'Retropolado' e 'Encerrado'.
+    """
+    pib = pib.copy()
+    pib['Unificado'] = coalesce(pib, list(PIB_SERIES.values()))
+    return pib
+
+def combine_data(metro_data, population_data, pib):
+    """
+    Consolida passageiros, PIB e população em um único DataFrame, com uma linha por ano.
+
+    Parâmetros:
+        - metro_data (DataFrame): Dados do metrô já limpos.
+        - population_data (DataFrame): Dados de população, limitados aos anos de interesse.
+        - pib (DataFrame): Dados de PIB com a série 'Unificado'.
+    """
+    # Consolidar dados de Passageiros por ano
+    # Somar em float64: os passageiros são armazenados em float32, que perde precisão em totais anuais
+    total_passengers_by_year = metro_data['passengers'].astype('float64').groupby(metro_data['year']).sum()
+    total_passengers_by_year.index = total_passengers_by_year.index.astype(int)
+
+    # Consolidar dados de População por ano
+    population_by_year = population_data.set_index('Ano')['População']
+    population_by_year.index = population_by_year.index.astype(int)
+
+    # Combinar em um único DataFrame
+    return pd.DataFrame({
+        'Passageiros': total_passengers_by_year,
+        'PIB': pib['Unificado'],
+        'População': population_by_year
+    })
+
+# Carregamento e limpeza prévia de cada fonte: (função de carga, função de limpeza)
+SOURCES = {
+    'metro': (load_metro, fix_subway_line),
+    'population': (load_population, interpolate_population),
+    'pib': (load_pib, unify_pib),
+}
+
+def load_source(name, clean=True):
+    """
+    Carrega uma das fontes de dados e, opcionalmente, aplica a sua limpeza prévia
+    (linhas do metrô sem espaços duplos, população interpolada e série unificada do PIB).
+
+    Parâmetros:
+        - name (str): Nome da fonte ('metro', 'population' ou 'pib').
+        - clean (bool): Aplica a limpeza prévia da fonte.
+
+    Retorna:
+        - Tupla (DataFrame, segundos gastos na carga e limpeza).
+    """
+    load, cleanup = SOURCES[name]
+    start = time.perf_counter()
+    data = load()
+    if clean:
+        data = cleanup(data)
+    return data, time.perf_counter() - start
+
+def load_sources(clean=True, executor=LOAD_EXECUTOR):
+    """
+    Carrega (e limpa) as três fontes de dados ao mesmo tempo. As fontes são independentes
+    até a consolidação, então as leituras lentas (ex.: disco de rede) se sobrepõem.
+
+    Parâmetros:
+        - clean (bool): Aplica a limpeza prévia de cada fonte (ver load_source).
+        - executor (str): "thread", "process" ou None para carregar em sequência.
+
+    Retorna:
+        - Tupla (dicionário nome -> DataFrame, dicionário nome -> segundos, incluindo 'total').
+    """
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+    names = list(SOURCES)
+    start = time.perf_counter()
+    if executor is None:
+        results = [load_source(name, clean) for name in names]
+    else:
+        pool = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}[executor]
+        with pool(max_workers=len(names)) as workers:
+            results = list(workers.map(load_source, names, [clean] * len(names)))
+
+    frames = {name: data for name, (data, _) in zip(names, results)}
+    timings = {name: seconds for name, (_, seconds) in zip(names, results)}
+    timings['total'] = time.perf_counter() - start
+    return frames, timings
+
+def prepare_combined_data(drop_years=(2023,)):
+    """
+    Carrega e limpa os três conjuntos de dados e retorna os dados combinados por ano,
+    aplicando as mesmas etapas de main.py, mas sem análises, gráficos ou saídas de texto.
+
+    Parâmetros:
+        - drop_years (tuple): Anos removidos dos dados do metrô (2023 não tem dados completos de passageiros).
+    """
+    frames, _ = load_sources()
+
+    metro_data = frames['metro']
+    metro_data = remove_leading_nan(metro_data[~metro_data['year'].isin(drop_years)])
+
+    # Manter a população apenas nos anos com dados de passageiros
+    population_data = frames['population']
+    population_data = population_data[population_data['Ano'].between(metro_data['year'].min(), metro_data['year'].max())]
+
+    return combine_data(metro_data, population_data, frames['pib'])
 
+# Instrumentação das funções públicas (somente quando INSTRUMENT estiver habilitado)
+instrument_module(globals())
@@ -1,28 +1,223 @@
 # USER MODULES
-from config import PLOT, SAVE, SHOW
+from config import PLOT, SAVE, SHOW, PARALLEL_PLOT, PLOT_WORKERS, BOXPLOT_PAGE_SIZE, RENDER_CACHE, PREVIEW, PREVIEW_DPI
 from user_text_lib import p, secao
+from user_instrument_lib import instrument_module
+from user_corr_lib import correlation_matrix, top_k_view, clustered_view
+from user_load_lib import frame_hash
+from user_pipeline_lib import code_fingerprint
 
 # OTHER MODULES -- INSTALL DEPENDENCIES
+import os
+import time
+import pickle
+import hashlib
+import functools
+import importlib.metadata
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.preprocessing import MinMaxScaler
-from PIL import Image
 
-def save_png(filename):
+# matplotlib, seaborn, scikit-learn e PIL são importados dentro das funções que os usam,
+# para que execuções sem gráficos (PLOT = False) não paguem o custo dessas importações.
+
+# Fila de gráficos aguardando renderização paralela (usada quando PARALLEL_PLOT = True)
+chart_queue = []
+
+# Tempos de renderização de cada gráfico já gerado: lista de (título, segundos)
+render_times = []
+
+# Títulos dos gráficos cuja renderização foi pulada por não terem mudado
+skipped_charts = []
+
+def image_path(filename):
+    # Caminho do PNG de um gráfico (pasta de pré-visualização no modo PREVIEW)
+    return ("images/preview/" if PREVIEW else "images/")+filename+".png"
+
+def save_png(filename, fig=None, **options):
     # Salvar o gráfico como PNG
+    import matplotlib.pyplot as plt
     if SAVE:
-        filepath = "images/"+filename+".png"
-        plt.savefig(filepath, format='png', dpi=300)  # Salvar o gráfico em alta resolução (300 dpi)
+        filepath = image_path(filename)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        # Salvar o gráfico em alta resolução (300 dpi), ou em baixa resolução no modo PREVIEW
+        (fig or plt).savefig(filepath, format='png', dpi=PREVIEW_DPI if PREVIEW else 300, **options)
+
+@functools.lru_cache(maxsize=None)
+def library_versions():
+    # Versões das bibliotecas que afetam a imagem gerada (sem importá-las)
+    versions = {}
+    for library in ['matplotlib', 'seaborn', 'pandas', 'numpy', 'scikit-learn']:
+        try:
+            versions[library] = importlib.metadata.version(library)
+        except importlib.metadata.PackageNotFoundError:
+            versions[library] = None
+    return versions
+
+def value_fingerprint(value, digest):
+    # Acrescenta ao hash o conteúdo de um argumento de desenho (DataFrames pelo conteúdo, não pelo id)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        try:
+            digest.update(frame_hash(value.to_frame() if isinstance(value, pd.Series) else value).encode())
+            return
+        except TypeError:
+            # Colunas com objetos não hasheáveis pelo pandas (ex.: arrays de outliers do boxplot)
+            pass
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            value_fingerprint(item, digest)
+        return
+    digest.update(pickle.dumps(value))
+
+def chart_fingerprint(draw, args, title, save_options):
+    """
+    Identifica um gráfico: código da função de desenho, dados e demais argumentos, título,
+    opções de gravação, resolução e versões das bibliotecas.
+    """
+    digest = hashlib.sha256(code_fingerprint(draw).encode())
+    value_fingerprint(args, digest)
+    digest.update(repr((title, sorted(save_options.items()), PREVIEW, PREVIEW_DPI, library_versions())).encode())
+    return digest.hexdigest()
+
+def saved_fingerprint(filename):
+    # Identificação gravada nos metadados do PNG existente (None se não houver)
+    path = image_path(filename)
+    if not os.path.exists(path):
+        return None
+    from PIL import Image
+    with Image.open(path) as img:
+        return img.info.get('Fingerprint')
 
 def show():
+    import matplotlib.pyplot as plt
     if SHOW:
         plt.ion() 
         plt.show()
     else:
         plt.ioff()
-        
+
+def render_chart(draw, args, title, save_options, interactive=True):
+    """
+    Desenha um gráfico, salva o PNG e fecha a figura imediatamente, para não acumular memória.
+
+    Parâmetros:
+    - draw: Função que recebe 'args' e 'title' e retorna a figura desenhada.
+    - args: Argumentos posicionais para 'draw'.
+    - title: Título do gráfico (também usado como nome do arquivo).
+    - save_options: Opções adicionais para savefig.
+    - interactive: Se False, a figura nunca é exibida na tela (renderização em segundo plano).
+
+    Retorna:
+    - Tempo de renderização, em segundos.
+    """
+    import matplotlib.pyplot as plt
+    start = time.perf_counter()
+    fig = draw(*args, title)
+    save_png(title, fig, **save_options)
+    if interactive and SHOW:
+        show()
+    else:
+        plt.close(fig)
+    return time.perf_counter() - start
+
+def init_render_worker():
+    # Processos de renderização usam sempre o backend não interativo
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+
+def render_job(job):
+    draw, args, title, save_options = job
+    return title, render_chart(draw, args, title, save_options, interactive=False)
+
+def submit_chart(draw, args, title, interactive=True, **save_options):
+    """
+    Renderiza um gráfico imediatamente ou, se PARALLEL_PLOT estiver habilitado,
+    coloca-o na fila para renderização paralela em render_queue().
+
+    Parâmetros:
+    - draw: Função de desenho do gráfico.
+    - args: Argumentos posicionais para 'draw' (apenas os dados necessários ao gráfico).
+    - title: Título do gráfico.
+    - interactive: Se False, a figura não é exibida na tela mesmo com SHOW habilitado.
+    - save_options: Opções adicionais para savefig.
+
+    Com RENDER_CACHE, o gráfico não é desenhado se o PNG salvo tiver a mesma identificação
+    (chart_fingerprint, gravada nos metadados da imagem), a menos que vá ser exibido na tela.
+    """
+    if RENDER_CACHE and SAVE:
+        fingerprint = chart_fingerprint(draw, args, title, save_options)
+        if not (interactive and SHOW) and saved_fingerprint(title) == fingerprint:
+            skipped_charts.append(title)
+            p(f"Sem alterações, renderização pulada: {title}")
+            return
+        save_options = {**save_options, 'metadata': {'Fingerprint': fingerprint}}
+
+    if PARALLEL_PLOT:
+        chart_queue.append((draw, args, title, save_options))
+    else:
+        elapsed = render_chart(draw, args, title, save_options, interactive)
+        render_times.append((title, elapsed))
+        p(f"Renderizado em {elapsed:.2f}s: {title}")
+
+def render_queue(workers=PLOT_WORKERS):
+    """
+    Renderiza todos os gráficos da fila em um pool de processos, com backend não interativo.
+    No máximo dois gráficos por processo ficam em andamento ao mesmo tempo, de modo que
+    o uso de memória não cresce com o número de gráficos solicitados.
+
+    Parâmetros:
+    - workers: Número de processos (None = número de CPUs).
+
+    Retorna:
+    - Lista de (título, segundos) com o tempo de renderização de cada gráfico.
+    """
+    if not chart_queue:
+        return []
+
+    secao(f"Renderização paralela de {len(chart_queue)} gráficos")
+    workers = workers or os.cpu_count() or 1
+    times = []
+
+    jobs = iter(chart_queue)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_render_worker) as executor:
+        pending = set()
+        for job in jobs:
+            pending.add(executor.submit(render_job, job))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    times.append(future.result())
+                    p(f"Renderizado em {times[-1][1]:.2f}s: {times[-1][0]}")
+        for future in pending:
+            times.append(future.result())
+            p(f"Renderizado em {times[-1][1]:.2f}s: {times[-1][0]}")
+
+    chart_queue.clear()
+    render_times.extend(times)
+    return times
+
+def draw_scatter(data, x_column, y_column, title):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(12, 6))
+
+    # Scatter plot
+    plt.scatter(data[x_column], data[y_column], color='blue', alpha=0.6, label='Dados')
+
+    # Calcular a linha de regressão y = ax + b
+    x = data[x_column]
+    y = data[y_column]
+    a, b = np.polyfit(x, y, 1)  # Ajuste de uma linha (grau 1)
+
+    # Adicionar a linha de regressão ao gráfico
+    plt.plot(x, a * x + b, color='red', linestyle='--', label=f'Linha de Regressão: y = {a:.2f}x + {b:.2f}')
+
+    # Configurações do gráfico
+    plt.xlabel(x_column)
+    plt.ylabel(y_column)
+    plt.title(title)
+    plt.legend()
+    plt.grid(True)
+    return fig
+
 def plot_scatter(data, x_column, y_column, title):
     """
     Função para criar um scatter plot entre duas colunas de um DataFrame e adicionar uma linha de regressão y = ax + b.
@@ -35,45 +230,65 @@ def plot_scatter(data, x_column, y_column, title):
     """
     if PLOT:
         p("Scatter: "+title)
-        plt.figure(figsize=(12, 6))
-        
-        # Scatter plot
-        plt.scatter(data[x_column], data[y_column], color='blue', alpha=0.6, label='Dados')
-
-        # Calcular a linha de regressão y = ax + b
-        x = data[x_column]
-        y = data[y_column]
-        a, b = np.polyfit(x, y, 1)  # Ajuste de uma linha (grau 1)
-
-        # Adicionar a linha de regressão ao gráfico
-        plt.plot(x, a * x + b, color='red', linestyle='--', label=f'Linha de Regressão: y = {a:.2f}x + {b:.2f}')
-
-        # Configurações do gráfico
-        plt.xlabel(x_column)
-        plt.ylabel(y_column)
-        plt.title(title)
-        plt.legend()
-        plt.grid(True)
-        # Salvar o gráfico como PNG
-        save_png(title)
-        show()
+        submit_chart(draw_scatter, (data[[x_column, y_column]], x_column, y_column), title)
+
+def draw_correlation_heatmap(correlation, title):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    # Matrizes grandes: figura proporcional ao número de séries e sem os valores escritos nas células
+    size = max(len(correlation.index), len(correlation.columns))
+    annotate = size <= 15
+    fig = plt.figure(figsize=(max(8, 0.3 * len(correlation.columns)), max(6, 0.3 * len(correlation.index))))
+    # Escala de 0 a 1 quando todas as correlações são positivas; de -1 a 1 caso contrário
+    vmin = 0 if (correlation.fillna(0) >= 0).all().all() else -1
+    sns.heatmap(correlation, annot=annotate, cmap="coolwarm", fmt=".2f", cbar=True, vmin=vmin, vmax=1)
+    plt.title(title)
+    return fig
 
-def plot_correlation_heatmap(data, title):
+def plot_correlation_heatmap(data, title, method='pearson', view=None, k=15, reference=None):
     """
     Função para criar um correlation heatmap matrix entre todas as colunas de um DataFrame.
+    A matriz é calculada em blocos, com NaN tratado par a par (user_corr_lib), e somente ela
+    é enviada para a renderização.
     
     Parâmetros:
-    - data: DataFrame contendo os dados.
+    - data: DataFrame contendo os dados (uma série por coluna).
     - title: Título do gráfico.
+    - method: 'pearson' ou 'spearman'.
+    - view: None (matriz completa), 'top' (as 'k' séries mais correlacionadas com 'reference')
+      ou 'cluster' (séries reordenadas por agrupamento hierárquico).
+    - k: Número de séries na visão 'top'.
+    - reference: Coluna de referência da visão 'top' (None = maior correlação média).
     """
     if PLOT:
         p("Correlation Heatmap Matrix: "+title)
-        correlation_matrix = data.corr()
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", fmt=".2f", cbar=True, vmin=0, vmax=1)
-        plt.title(title)
-        save_png(title)
-        show()
+        correlation = correlation_matrix(data, method=method)
+        if view == 'top':
+            correlation = top_k_view(correlation, k, reference)
+        elif view == 'cluster':
+            correlation = clustered_view(correlation)
+        # Nas visões com muitas estações, o recorte 'tight' evita cortar os nomes longos
+        save_options = {'bbox_inches': 'tight'} if view else {}
+        submit_chart(draw_correlation_heatmap, (correlation,), title, **save_options)
+
+def draw_minmax(data, x_label, y_label, title):
+    import matplotlib.pyplot as plt
+    from sklearn.preprocessing import MinMaxScaler
+    # Normalizar com Min-Max para cada serie
+    scaler = MinMaxScaler()
+    normalized_data = pd.DataFrame(scaler.fit_transform(data), columns=data.columns, index=data.index)
+    # Plotar cada coluna com labels
+    fig = plt.figure(figsize=(12, 6))
+    for column in normalized_data.columns:
+        plt.plot(normalized_data.index, normalized_data[column], label=column, marker='o')
+    # Configurações
+    plt.xlabel(x_label)
+    plt.ylabel(y_label)
+    plt.title(title)
+    plt.legend()
+    plt.grid(True)
+    plt.xticks(ticks=normalized_data.index, rotation=90)
+    return fig
 
 def plot_minmax(data,x_label,y_label,title):
     """
@@ -88,24 +303,33 @@ def plot_minmax(data,x_label,y_label,title):
     """
     if PLOT:
         p("Line Min/Max: "+title)
-        # Normalizar com Min-Max para cada serie
-        scaler = MinMaxScaler()
-        normalized_data = pd.DataFrame(scaler.fit_transform(data), columns=data.columns, index=data.index)
-        # Plotar cada coluna com labels
-        plt.figure(figsize=(12, 6))
-        for column in normalized_data.columns:
-            plt.plot(normalized_data.index, normalized_data[column], label=column, marker='o')
-        # Configurações
-        plt.xlabel(x_label)
-        plt.ylabel(y_label)
-        plt.title(title)
-        plt.legend()
-        plt.grid(True)
-        plt.xticks(ticks=normalized_data.index, rotation=90)
-        save_png(title)
-        show()
+        submit_chart(draw_minmax, (data, x_label, y_label), title)
 
-def plot_line(data,x_label,y_label,title):
+def draw_line(data, x_label, y_label, bands, title):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(12, 6))
+    band_columns = [column for bounds in bands.values() for column in bounds]
+
+    # Plotar cada coluna como uma série no gráfico
+    for column in data.columns:
+        if column not in band_columns:
+            plt.plot(data.index, data[column], label=column, marker='o')
+
+    # Faixas sombreadas entre as colunas inferior e superior de cada faixa
+    for label, (low, high) in bands.items():
+        valid = data[low].notna() & data[high].notna()
+        plt.fill_between(data.index[valid], data.loc[valid, low], data.loc[valid, high], alpha=0.25, label=label)
+    
+    # Configurações do gráfico
+    plt.xlabel(x_label)
+    plt.ylabel(y_label)
+    plt.title(title)
+    plt.legend()
+    plt.grid(True)
+    plt.xticks(ticks=data.index,rotation=90)
+    return fig
+
+def plot_line(data,x_label,y_label,title,bands=None):
     """
     Cria um gráfico de linha para cada coluna do DataFrame 'data'.
     
@@ -114,75 +338,153 @@ def plot_line(data,x_label,y_label,title):
     x_label
     y_label
     title
+    bands (dict): Faixas sombreadas, rótulo -> (coluna inferior, coluna superior); essas colunas não viram linhas.
     """
     if PLOT:
         p("Line: "+title)
-        plt.figure(figsize=(12, 6))
-        
-        # Plotar cada coluna como uma série no gráfico
-        for column in data.columns:
-            plt.plot(data.index, data[column], label=column, marker='o')
-        
-        # Configurações do gráfico
-        plt.xlabel(x_label)
-        plt.ylabel(y_label)
-        plt.title(title)
-        plt.legend()
-        plt.grid(True)
-        plt.xticks(ticks=data.index,rotation=90)
-        save_png(title)
-        show()
+        submit_chart(draw_line, (data, x_label, y_label, bands or {}), title)
+
+def boxplot_stats(data, x_column, y_column, category):
+    """
+    Calcula, em uma única passada agrupada, as estatísticas de todas as caixas (uma por categoria
+    e valor de x): quartis (interpolação linear, como o matplotlib), bigodes até 1,5 x IQR e outliers.
+
+    Parâmetros:
+    - data: DataFrame com os dados no formato longo.
+    - x_column, y_column, category: Colunas do eixo x, do eixo y e das facetas.
+
+    Retorna:
+    - DataFrame indexado por (category, x_column) com as colunas 'q1', 'med', 'q3', 'whislo',
+      'whishi' e 'fliers' (array com os outliers), no formato aceito por Axes.bxp.
+    """
+    values = data[[category, x_column, y_column]].dropna(subset=[y_column])
+    keys = [values[category], values[x_column]]
+    y = values[y_column].astype('float64')
+
+    stats = y.groupby(keys, observed=True).quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'med', 'q3']
+    iqr = stats['q3'] - stats['q1']
+    lower, upper = stats['q1'] - 1.5 * iqr, stats['q3'] + 1.5 * iqr
+
+    # Limites de cada caixa levados para as linhas, para separar bigodes e outliers sem laço por grupo
+    row_keys = pd.MultiIndex.from_arrays(keys)
+    inside = (y.to_numpy() >= lower.reindex(row_keys).to_numpy()) & (y.to_numpy() <= upper.reindex(row_keys).to_numpy())
+    # Como no matplotlib, o bigode termina no quartil quando não há valores entre o quartil e o limite
+    stats['whislo'] = np.minimum(y.where(inside).groupby(keys, observed=True).min(), stats['q1'])
+    stats['whishi'] = np.maximum(y.where(inside).groupby(keys, observed=True).max(), stats['q3'])
+
+    # Outliers agrupados por caixa: ordenados pela posição da caixa e divididos pelas contagens
+    box = stats.index.get_indexer(row_keys[~inside])
+    order = np.argsort(box, kind='stable')
+    counts = np.bincount(box, minlength=len(stats))
+    fliers = np.split(y.to_numpy()[~inside][order], np.cumsum(counts)[:-1])
+    stats['fliers'] = pd.Series(fliers, index=stats.index, dtype=object)
+    return stats
+
+def boxplot_pages(data, x_column, y_column, category, page_size=BOXPLOT_PAGE_SIZE):
+    """
+    Prepara os dados de desenho dos boxplots por faceta, divididos em páginas de até 'page_size'
+    facetas (None = todas em uma página). Apenas as estatísticas, e não os registros, vão para o desenho.
 
-def plot_boxplot(data, x_column, y_column, category, cols, x_label, y_label, title):
+    Retorna:
+    - Lista de (stats, levels, x_order) por página: estatísticas das caixas, valores de x presentes
+      em cada faceta (para as cores) e a ordem do eixo x, comum a todas as facetas.
     """
-    Cria gráficos de boxplot para cada categoria em um FacetGrid.
+    stats = boxplot_stats(data, x_column, y_column, category)
+    # Valores de x de cada faceta (inclusive sem valor de y), como as cores do hue no seaborn
+    levels = data.groupby(category, observed=True)[x_column].unique().map(sorted)
+    x_order = sorted(data[x_column].unique())
+    facets = list(levels.index)
+    page_size = page_size or max(len(facets), 1)
+    return [(stats[stats.index.get_level_values(0).isin(facets[start:start + page_size])],
+             levels[facets[start:start + page_size]], x_order)
+            for start in range(0, len(facets), page_size)]
+
+def draw_boxplot(stats, levels, x_order, cols, x_label, y_label, title):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from colorsys import rgb_to_hls
+
+    # Mesma disposição do FacetGrid: 'cols' facetas por linha, cada uma com 4 x 4 polegadas
+    rows = -(-len(levels) // cols)
+    fig, axes = plt.subplots(rows, cols, figsize=(4 * cols, 4 * rows), squeeze=False)
+    positions = {x: position for position, x in enumerate(x_order)}
+    by_facet = dict(list(stats.groupby(level=0, observed=True)))
+
+    for index, (ax, (facet, facet_levels)) in enumerate(zip(axes.flat, levels.items())):
+        # Cores como no seaborn: paleta "Oranges" sobre os valores de x da faceta (saturação 0.75)
+        # e linhas em cinza com 60% da menor luminosidade da paleta
+        palette = dict(zip(facet_levels, sns.color_palette("Oranges", len(facet_levels), desat=0.75)))
+        gray = min(rgb_to_hls(*color)[1] for color in palette.values()) * 0.6
+        linecolor = (gray, gray, gray)
+
+        facet_stats = by_facet[facet].droplevel(0) if facet in by_facet else stats.iloc[:0].droplevel(0)
+        boxes = ax.bxp(facet_stats.to_dict('records'), positions=[positions[x] for x in facet_stats.index],
+                       widths=0.8, capwidths=0.4, patch_artist=True, manage_ticks=False,
+                       boxprops={'edgecolor': linecolor},
+                       medianprops={'color': linecolor, 'solid_capstyle': 'butt'},
+                       whiskerprops={'color': linecolor, 'solid_capstyle': 'butt'},
+                       capprops={'color': linecolor},
+                       flierprops={'marker': 'o', 'markersize': 1, 'linestyle': 'none', 'markeredgecolor': linecolor})
+        for box, x in zip(boxes['boxes'], facet_stats.index):
+            box.set_facecolor(palette[x])
+
+        ax.set_xticks(range(len(x_order)), [str(x) for x in x_order])
+        ax.set_xlim(-0.5, len(x_order) - 0.5)
+        ax.set_title(facet, fontsize=plt.rcParams['axes.labelsize'])
+        # Rótulos dos eixos somente na linha de baixo (x) e na coluna da esquerda (y)
+        ax.set_xlabel(x_label if index + cols >= len(levels) else "")
+        ax.set_ylabel(y_label if index % cols == 0 else "")
+
+        # Rotacionar e reduzir o tamanho da fonte dos rótulos dos eixos x e y
+        for label in ax.get_xticklabels():
+            label.set_rotation(90)
+            label.set_fontsize(6)
+        for label in ax.get_yticklabels():
+            label.set_fontsize(6)
+
+    # Remover as posições da grade que sobraram sem faceta
+    for ax in axes.flat[len(levels):]:
+        fig.delaxes(ax)
+
+    fig.tight_layout()
+    fig.suptitle(title, y=1.01)
+    return fig
+
+def plot_boxplot(data, x_column, y_column, category, cols, x_label, y_label, title, page_size=BOXPLOT_PAGE_SIZE):
+    """
+    Cria gráficos de boxplot para cada categoria, um gráfico (faceta) por categoria.
+    As estatísticas de todas as caixas são calculadas de uma vez (boxplot_stats) e desenhadas
+    diretamente, sem reenviar os registros para o seaborn.
     
     Parâmetros:
     data (DataFrame): O DataFrame contendo os dados.
     x_column (str): Nome da coluna para o eixo x.
     y_column (str): Nome da coluna para o eixo y.
-    category (str): Nome da coluna para separar os gráficos no FacetGrid.
-    cols (int): Número de colunas no FacetGrid.
+    category (str): Nome da coluna para separar os gráficos.
+    cols (int): Número de colunas de gráficos.
     x_label (str): Rótulo para o eixo x.
     y_label (str): Rótulo para o eixo y.
     title (str): Título do gráfico.
+    page_size (int): Número de categorias por imagem (None = todas em uma única imagem).
+        Cada página é um gráfico separado, renderizado em paralelo com PARALLEL_PLOT.
     """
     if PLOT:
         p("BoxPlot: "+title)
 
-        # Definir uma lista ordenada para o eixo X
-        x_order = sorted(data[x_column].unique())
-
-        # Configurar as propriedades dos outliers (fliers)
-        flierprops = dict(marker='o', markersize=1, linestyle='none')  # Adjust markersize to make dots smaller
-
-        # Configurar a figura com FacetGrid para criar um gráfico de boxplot para cada categoria
-        g = sns.FacetGrid(data, col=category, col_wrap=cols, height=4, sharex=False, sharey=False, despine=False)
-        g.map_dataframe(sns.boxplot, x=x_column, y=y_column, palette="Oranges", hue=x_column, order=x_order, flierprops=flierprops)
-
-        # Ajustar os rótulos e layout
-        g.set_axis_labels(x_label, y_label)
-        g.set_titles("{col_name}")
-        g.fig.suptitle(title,y=1.01)
-
-        # Rotacionar e reduzir o tamanho da fonte dos rótulos dos eixos x e y em todos os gráficos
-        for ax in g.axes.flat:
-            # Ajuste para os rótulos do eixo x
-            for label in ax.get_xticklabels():
-                label.set_rotation(90)
-                label.set_fontsize(6)  # Ajustar o tamanho da fonte do eixo x para 8
-
-            # Ajuste para os rótulos do eixo y
-            for label in ax.get_yticklabels():
-                label.set_fontsize(6)  # Ajustar o tamanho da fonte do eixo y para 8
+        pages = boxplot_pages(data, x_column, y_column, category, page_size)
+        titles = [title] if len(pages) == 1 else [f"{title} - Página {page} de {len(pages)}" for page in range(1, len(pages) + 1)]
 
-        # Salvar como uma imagem de alta resolução sem abrir no Matplotlib
-        if SAVE:
-            file_path = "images/"+title+".png"
-            g.savefig(file_path, dpi=300)
+        for (stats, levels, x_order), page_title in zip(pages, titles):
+            # Salvar como uma imagem de alta resolução sem abrir no Matplotlib
+            submit_chart(draw_boxplot, (stats, levels, x_order, cols, x_label, y_label), page_title, interactive=False, bbox_inches='tight')
 
         # Abrir a imagem salva em um editor de imagem
-        if SHOW:
-            img = Image.open(file_path)
-            img.show()
+        if SHOW and SAVE and not PARALLEL_PLOT:
+            from PIL import Image
+            for page_title in titles:
+                img = Image.open(image_path(page_title))
+                img.show()
 
+# Instrumentação das funções públicas (somente quando INSTRUMENT estiver habilitado)
+instrument_module(globals())
@@ -0,0 +1,162 @@
+# Módulos do Usuário
+from config import INSTRUMENT, REPORT_FILE, PROFILE_STAGES, PROFILE_DIR
+
+# Importação de outros módulos necessários
+import os
+import sys
+import json
+import time
+import types
+import datetime
+import functools
+import contextlib
+import tracemalloc
+
+# Medições por etapa (na ordem de execução) e por função (agregadas por nome)
+stage_records = []
+function_records = {}
+
+# Pilha com o maior pico de memória (tracemalloc) observado nas medições em andamento
+peak_stack = []
+
+started = time.perf_counter()
+
+def peak_rss_mb():
+    """
+    Retorna o pico de memória residente (RSS) do processo até agora, em MB (None se indisponível).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é informado em bytes no macOS e em KB no Linux
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+def count_rows(*values):
+    """
+    Soma o número de linhas dos DataFrames, Series e arrays em 'values' (None se não houver nenhum).
+    """
+    rows = [len(value) for value in values if hasattr(value, 'shape') and getattr(value, 'ndim', 0) > 0]
+    return sum(rows) if rows else None
+
+@contextlib.contextmanager
+def measure(rows_in=None):
+    """
+    Mede o bloco de código: tempo de relógio, tempo de CPU, pico de memória alocada em Python
+    (tracemalloc, em relação ao início do bloco) e pico de RSS do processo.
+
+    Parâmetros:
+        - rows_in (int): Número de linhas de entrada, copiado para a medição.
+
+    Retorna (via 'with ... as record'):
+        - dict com a medição, preenchido ao final do bloco; 'rows_out' pode ser definido pelo chamador.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    peak_stack.append(current)
+
+    record = {'rows_in': rows_in, 'rows_out': None}
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield record
+    finally:
+        record['wall'] = time.perf_counter() - wall
+        record['cpu'] = time.process_time() - cpu
+
+        # O pico do bloco inclui o de medições internas, que reiniciaram o contador do tracemalloc
+        peak = max(tracemalloc.get_traced_memory()[1], peak_stack.pop())
+        record['tracemalloc_peak_mb'] = (peak - current) / 1024 ** 2
+        record['peak_rss_mb'] = peak_rss_mb()
+        if peak_stack:
+            peak_stack[-1] = max(peak_stack[-1], peak)
+
+@contextlib.contextmanager
+def measure_stage(name, rows_in=None):
+    """
+    Mede uma etapa do processamento e guarda a medição no relatório.
+    Com PROFILE_STAGES, grava também o perfil cProfile da etapa em PROFILE_DIR.
+
+    Parâmetros:
+        - name (str): Nome da etapa.
+        - rows_in (int): Número de linhas de entrada da etapa.
+    """
+    if not INSTRUMENT:
+        yield {}
+        return
+
+    profiler = None
+    if PROFILE_STAGES:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        with measure(rows_in) as record:
+            yield record
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profiler.dump_stats(os.path.join(PROFILE_DIR, f"{name}.prof"))
+        stage_records.append({'stage': name, **record})
+
+def instrument(function):
+    """
+    Envolve uma função para medir cada chamada; as medições são agregadas pelo nome da função.
+    """
+    name = f"{function.__module__}.{function.__qualname__}"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with measure(count_rows(*args, *kwargs.values())) as record:
+            result = function(*args, **kwargs)
+            record['rows_out'] = count_rows(result)
+        summary = function_records.setdefault(name, {
+            'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'tracemalloc_peak_mb': 0.0, 'peak_rss_mb': None,
+            'rows_in': 0, 'rows_out': 0,
+        })
+        summary['calls'] += 1
+        summary['wall'] += record['wall']
+        summary['cpu'] += record['cpu']
+        summary['tracemalloc_peak_mb'] = max(summary['tracemalloc_peak_mb'], record['tracemalloc_peak_mb'])
+        summary['peak_rss_mb'] = record['peak_rss_mb']
+        summary['rows_in'] += record['rows_in'] or 0
+        summary['rows_out'] += record['rows_out'] or 0
+        return result
+    return wrapper
+
+def instrument_module(namespace):
+    """
+    Substitui todas as funções públicas definidas em um módulo por versões instrumentadas.
+    Deve ser chamada ao final do módulo com globals(); não faz nada se INSTRUMENT estiver desabilitado.
+
+    Parâmetros:
+        - namespace (dict): globals() do módulo.
+    """
+    if not INSTRUMENT:
+        return
+    for name, value in list(namespace.items()):
+        if isinstance(value, types.FunctionType) and not name.startswith('_') and value.__module__ == namespace['__name__']:
+            namespace[name] = instrument(value)
+
+def write_report(path=REPORT_FILE):
+    """
+    Grava o relatório JSON da execução (etapas e funções instrumentadas), se INSTRUMENT estiver habilitado.
+
+    Parâmetros:
+        - path (str): Caminho do arquivo JSON.
+    """
+    if not INSTRUMENT:
+        return
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'total_wall': time.perf_counter() - started,
+        'total_cpu': time.process_time(),
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': stage_records,
+        'functions': dict(sorted(function_records.items(), key=lambda item: -item[1]['wall'])),
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
@@ -0,0 +1,139 @@
+# Módulos do Usuário
+from config import CACHE, CACHE_DIR
+
+# Importação de outros módulos necessários
+import os
+import hashlib
+import pandas as pd
+from user_table_lib import read_table, read_wide_table
+
+# Versão do formato do cache; incrementar sempre que a lógica de leitura mudar
+CACHE_VERSION = 2
+
+# Ordem dos meses, como aparecem em metro.csv
+MONTHS = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+# Séries do PIB a preços correntes em pib.csv (Nível -> coluna), em ordem de prioridade
+PIB_SERIES = {'1.1': 'Revisado', '1.2': 'Retropolado', '1.3': 'Encerrado'}
+
+# Tipos compactos para as colunas de metro.csv
+METRO_DTYPES = {
+    'Station': 'category',
+    'subway_line': 'category',
+    'month': pd.CategoricalDtype(MONTHS, ordered=True),
+    'passengers': 'float32',
+    'year': 'int16',
+}
+
+def file_hash(path):
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo, lendo-o em blocos.
+
+    Parâmetros:
+        - path (str): Caminho do arquivo.
+
+    Retorna:
+        - str: Hash hexadecimal do conteúdo.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def frame_hash(data):
+    """
+    Calcula um hash SHA-256 do conteúdo de um DataFrame (valores, índice, colunas e tipos).
+
+    Parâmetros:
+        - data (DataFrame): Dados a serem identificados.
+
+    Retorna:
+        - str: Hash hexadecimal do conteúdo.
+    """
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in data.dtypes.items()]).encode())
+    return digest.hexdigest()
+
+def cached_load(path, parser):
+    """
+    Lê um arquivo de dados com a função 'parser', reaproveitando o resultado gravado
+    em cache (Parquet) quando o conteúdo do arquivo não mudou desde a última leitura.
+
+    Parâmetros:
+        - path (str): Caminho do arquivo de origem.
+        - parser (function): Função que recebe o caminho e retorna um DataFrame.
+
+    Retorna:
+        - DataFrame com os dados lidos.
+    """
+    if not CACHE:
+        return parser(path)
+
+    prefix = f"{parser.__name__}-v{CACHE_VERSION}-"
+    cache_path = os.path.join(CACHE_DIR, prefix + file_hash(path)[:16] + ".parquet")
+    if os.path.exists(cache_path):
+        return pd.read_parquet(cache_path)
+
+    data = parser(path)
+
+    # Gravar o novo cache e remover versões anteriores do mesmo arquivo
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(prefix):
+            os.remove(os.path.join(CACHE_DIR, name))
+    data.to_parquet(cache_path)
+    return data
+
+def parse_metro(path):
+    """
+    Lê o arquivo de passageiros do metrô com tipos compactos: categorias para os textos,
+    int16 para o ano, float32 para passageiros e datetime64 para 'year_month'.
+
+    Parâmetros:
+        - path (str): Caminho do arquivo CSV.
+    """
+    data = pd.read_csv(path, dtype=METRO_DTYPES)
+    data['year_month'] = pd.to_datetime(data['year_month'], format='%Y-%m-%d')
+    return data
+
+def parse_population(path):
+    """
+    Lê o arquivo de população, convertendo o campo 'População' (ex.: " 4,251,918 ") para número.
+
+    Parâmetros:
+        - path (str): Caminho do arquivo CSV.
+    """
+    data = read_table(path, thousands=',')
+    data['Ano'] = data['Ano'].astype('int16')
+    data['População'] = data['População'].astype(float)
+    return data
+
+def parse_pib(path):
+    """
+    Lê o arquivo de PIB do IBGE e extrai as três séries do PIB a preços correntes
+    (Níveis 1.1, 1.2 e 1.3), uma coluna por série e uma linha por ano.
+
+    Parâmetros:
+        - path (str): Caminho do arquivo CSV (delimitado por ';').
+    """
+    return read_wide_table(path, ['Nível'], PIB_SERIES, delimiter=';')
+
+def load_metro(path='data/metro.csv'):
+    """
+    Carrega os dados do metrô (tipados), usando o cache quando disponível.
+    """
+    return cached_load(path, parse_metro)
+
+def load_population(path='data/populacao.csv'):
+    """
+    Carrega os dados de população (já numéricos), usando o cache quando disponível.
+    """
+    return cached_load(path, parse_population)
+
+def load_pib(path='data/pib.csv'):
+    """
+    Carrega as séries de PIB (Revisado, Retropolado, Encerrado), usando o cache quando disponível.
+    """
+    return cached_load(path, parse_pib)
@@ -0,0 +1,180 @@
+# Módulos do Usuário
+from config import CACHE_DIR
+
+# Importação de outros módulos necessários
+import os
+import numpy as np
+import pandas as pd
+
+# Pasta onde a matriz estação x mês é gravada (arquivos .npy abertos com memmap)
+MATRIX_DIR = os.path.join(CACHE_DIR, "metro_matrix")
+
+class MetroMatrix:
+    """
+    Representação compacta dos dados do metrô: uma matriz float32 estação x mês com os passageiros
+    (NaN quando faltantes), uma matriz booleana indicando os registros existentes e os vetores de
+    índice (estações, linha de cada estação e meses, contínuos e ordenados).
+
+    Consultas por estação são fatias de uma linha da matriz (sem percorrer todos os registros) e
+    somas anuais, máscaras de faltantes e a remoção dos meses iniciais vazios são operações sobre
+    os arrays. Gravada com save(), a matriz é aberta com memmap; ao ser enviada a outro processo
+    (pickle), só o caminho da pasta é copiado e o processo reabre os mesmos arquivos.
+
+    Parâmetros:
+        - values (ndarray): Passageiros, float32 (estações, meses).
+        - present (ndarray): Registros existentes, bool (estações, meses).
+        - stations (ndarray): Nome de cada estação.
+        - lines (ndarray): Nome de cada linha do metrô.
+        - station_line (ndarray): Posição em 'lines' da linha de cada estação.
+        - months (ndarray): Primeiro dia de cada mês, datetime64[M].
+        - directory (str): Pasta dos arquivos, quando a matriz foi gravada ou aberta do disco.
+    """
+
+    def __init__(self, values, present, stations, lines, station_line, months, directory=None):
+        self.values = values
+        self.present = present
+        self.stations = stations
+        self.lines = lines
+        self.station_line = station_line
+        self.months = months
+        self.directory = directory
+        self.positions = {name: position for position, name in enumerate(stations)}
+
+    @classmethod
+    def from_frame(cls, metro_data, value_column='passengers'):
+        """
+        Monta a matriz a partir dos dados no formato longo (uma linha por estação e mês).
+        Os nomes de linha devem estar corrigidos (uma linha por estação).
+        """
+        stations = metro_data['Station'].astype('category').cat.remove_unused_categories()
+        lines = metro_data['subway_line'].astype('category').cat.remove_unused_categories()
+        months = metro_data['year_month'].to_numpy().astype('datetime64[M]')
+        first = months.min()
+        month_range = np.arange(first, months.max() + 1)
+
+        rows, columns = stations.cat.codes.to_numpy(), (months - first).astype(np.int64)
+        shape = (len(stations.cat.categories), len(month_range))
+        values = np.full(shape, np.nan, dtype=np.float32)
+        values[rows, columns] = metro_data[value_column].to_numpy(dtype=np.float32, na_value=np.nan)
+        present = np.zeros(shape, dtype=bool)
+        present[rows, columns] = True
+
+        station_line = np.zeros(shape[0], dtype=np.int16)
+        station_line[rows] = lines.cat.codes.to_numpy()
+        return cls(values, present, np.asarray(stations.cat.categories, dtype=str),
+                   np.asarray(lines.cat.categories, dtype=str), station_line, month_range)
+
+    @classmethod
+    def open(cls, directory=MATRIX_DIR, mmap_mode='r'):
+        """
+        Abre uma matriz gravada com save(); as matrizes de dados são mapeadas em memória.
+        """
+        with np.load(os.path.join(directory, "index.npz")) as index:
+            arrays = {name: index[name] for name in ['stations', 'lines', 'station_line', 'months']}
+        return cls(np.load(os.path.join(directory, "values.npy"), mmap_mode=mmap_mode),
+                   np.load(os.path.join(directory, "present.npy"), mmap_mode=mmap_mode),
+                   directory=directory, **arrays)
+
+    def save(self, directory=MATRIX_DIR):
+        """
+        Grava a matriz em 'directory' (values.npy, present.npy e index.npz) e retorna a matriz
+        reaberta com memmap a partir desses arquivos.
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "values.npy"), np.asarray(self.values))
+        np.save(os.path.join(directory, "present.npy"), np.asarray(self.present))
+        np.savez(os.path.join(directory, "index.npz"), stations=self.stations, lines=self.lines,
+                 station_line=self.station_line, months=self.months)
+        return MetroMatrix.open(directory)
+
+    def __reduce__(self):
+        # Matrizes gravadas são reabertas pelo caminho no outro processo (sem copiar os dados)
+        if self.directory is not None:
+            return (MetroMatrix.open, (self.directory,))
+        return (MetroMatrix, (self.values, self.present, self.stations, self.lines, self.station_line, self.months))
+
+    @property
+    def years(self):
+        """
+        Ano de cada coluna (mês) da matriz.
+        """
+        return self.months.astype('datetime64[Y]').astype(int) + 1970
+
+    def station(self, name):
+        """
+        Registros de uma estação ('year_month' e passageiros), sem percorrer as demais estações.
+        """
+        position = self.positions[name]
+        present = np.asarray(self.present[position])
+        return pd.DataFrame({
+            'year_month': self.months[present].astype('datetime64[ns]'),
+            'passengers': self.values[position, present],
+        })
+
+    def missing_mask(self):
+        """
+        Máscara (estações, meses) dos registros existentes sem valor de passageiros.
+        """
+        return self.present & np.isnan(self.values)
+
+    def missing_by_station(self):
+        """
+        Registros sem passageiros, registros e porcentagem de faltantes por estação
+        (mesmas colunas de missing_report(...)['station']).
+        """
+        summary = pd.DataFrame({
+            'Station': self.stations,
+            'missing_count': self.missing_mask().sum(axis=1),
+            'total_count': self.present.sum(axis=1),
+        })
+        summary['missing_percentage'] = (summary['missing_count'] / summary['total_count']) * 100
+        return summary
+
+    def first_valid(self):
+        """
+        Posição do primeiro mês com passageiros de cada estação (-1 quando não há nenhum).
+        """
+        valid = self.present & ~np.isnan(self.values)
+        return np.where(valid.any(axis=1), valid.argmax(axis=1), -1)
+
+    def trim_leading_nan(self):
+        """
+        Equivalente a remove_leading_nan: descarta os registros de cada estação anteriores ao
+        primeiro mês com passageiros e as estações sem nenhum valor. Retorna uma nova matriz em memória.
+        """
+        first = self.first_valid()
+        keep = first >= 0
+        present = self.present[keep] & (np.arange(len(self.months)) >= first[keep, None])
+        values = np.where(present, self.values[keep], np.float32(np.nan))
+        return MetroMatrix(values, present, self.stations[keep], self.lines, self.station_line[keep], self.months)
+
+    def yearly_by_station(self):
+        """
+        Total de passageiros por estação e ano (float64), com NaN nos anos sem registros da estação.
+        """
+        years = self.years
+        starts = np.flatnonzero(np.r_[True, years[1:] != years[:-1]])
+        totals = np.add.reduceat(np.where(self.present, np.nan_to_num(self.values), 0).astype(np.float64), starts, axis=1)
+        counts = np.add.reduceat(np.asarray(self.present, dtype=np.int32), starts, axis=1)
+        totals[counts == 0] = np.nan
+        return pd.DataFrame(totals, index=pd.Index(self.stations, name='Station'),
+                            columns=pd.Index(years[starts], name='year'))
+
+    def yearly_totals(self):
+        """
+        Total de passageiros por ano, somando todas as estações (float64).
+        """
+        return self.yearly_by_station().sum(axis=0)
+
+    def to_frame(self):
+        """
+        Converte de volta para o formato longo (uma linha por registro existente, ordenado por estação e mês).
+        """
+        rows, columns = np.nonzero(self.present)
+        return pd.DataFrame({
+            'Station': pd.Categorical.from_codes(rows, self.stations),
+            'subway_line': pd.Categorical.from_codes(self.station_line[rows], self.lines),
+            'passengers': self.values[rows, columns],
+            'year': self.years[columns].astype(np.int16),
+            'year_month': self.months[columns].astype('datetime64[ns]'),
+        })
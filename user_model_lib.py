@@ -0,0 +1,366 @@
+# Importação de outros módulos necessários
+import time
+import numpy as np
+
+# Parâmetros padrão do otimizador Adam (mesmos valores do Keras)
+ADAM_BETA_1 = 0.9
+ADAM_BETA_2 = 0.999
+ADAM_EPSILON = 1e-7
+
+# Regularização da regressão ridge (não aplicada ao intercepto)
+RIDGE_ALPHA = 1e-3
+
+def glorot_uniform(rng, n_in, n_out):
+    """
+    Inicialização Glorot uniforme, a mesma usada por padrão nas camadas Dense do Keras.
+    """
+    limit = np.sqrt(6.0 / (n_in + n_out))
+    return rng.uniform(-limit, limit, size=(n_in, n_out))
+
+class TrainingController:
+    """
+    Controle do treinamento época a época, independente do backend: parada antecipada
+    quando a perda monitorada para de melhorar (com restauração dos melhores pesos),
+    ajuste da taxa de aprendizado, limite de tempo e histórico das perdas por época.
+    O NumpyMLP chama epoch_end diretamente; no Keras é usado via keras_callback.
+
+    Com perdas por modelo (redes empilhadas do NumpyMLP), cada rede tem a sua própria melhor época,
+    paciência e taxa de aprendizado: as redes que param deixam de ser atualizadas ('active') e
+    o treinamento termina quando todas pararam.
+
+    Parâmetros:
+        - patience (int): Épocas sem melhora antes de parar (None = sem parada antecipada).
+        - lr_schedule (str): "plateau", "cosine" ou None (taxa fixa).
+        - lr_patience (int): Épocas sem melhora antes de reduzir a taxa ("plateau").
+        - lr_factor (float): Fator de redução da taxa ("plateau").
+        - min_lr (float): Taxa de aprendizado mínima.
+        - time_budget (float): Tempo máximo de treinamento, em segundos (None = sem limite).
+        - min_delta (float): Melhora mínima da perda para ser considerada.
+    """
+    def __init__(self, patience=None, lr_schedule=None, lr_patience=20, lr_factor=0.5, min_lr=1e-5,
+                 time_budget=None, min_delta=0.0):
+        self.patience = patience
+        self.lr_schedule = lr_schedule
+        self.lr_patience = lr_patience
+        self.lr_factor = lr_factor
+        self.min_lr = min_lr
+        self.time_budget = time_budget
+        self.min_delta = min_delta
+        if lr_schedule not in (None, 'plateau', 'cosine'):
+            raise ValueError(f"Ajuste de taxa de aprendizado desconhecido: {lr_schedule}")
+
+    def start(self, learning_rate, epochs):
+        """
+        Reinicia o controle no começo de um treinamento.
+        """
+        self.initial_lr = learning_rate
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.history = {'loss': [], 'val_loss': [], 'lr': []}
+        self.best_loss = np.inf
+        self.best_epoch = -1
+        self.best_weights = None
+        self.wait = 0
+        self.lr_wait = 0
+        self.active = np.array(True)
+        self.stopped_epoch = None
+        self.started = time.perf_counter()
+
+    def epoch_end(self, epoch, loss, val_loss, get_weights):
+        """
+        Registra as perdas da época e decide os próximos passos.
+
+        Parâmetros:
+            - epoch (int): Índice da época (a partir de 0).
+            - loss (float ou ndarray): Perda de treino (uma por modelo, para redes empilhadas).
+            - val_loss (float ou ndarray): Perda de validação (None = monitorar a perda de treino).
+            - get_weights (callable): Retorna uma cópia dos pesos atuais; com perdas por modelo,
+              o primeiro eixo de cada peso é o eixo dos modelos.
+
+        Retorna:
+            - Tupla (parar o treinamento, taxa de aprendizado da próxima época: float ou uma por modelo).
+        """
+        monitored = np.asarray(loss if val_loss is None else val_loss, dtype=float)
+        self.history['loss'].append(float(np.mean(loss)))
+        self.history['val_loss'].append(None if val_loss is None else float(np.mean(val_loss)))
+        self.history['lr'].append(float(np.mean(self.learning_rate)))
+
+        # Somente as redes ainda ativas podem melhorar (as paradas mantêm os seus melhores pesos)
+        improved = (monitored < self.best_loss - self.min_delta) & self.active
+        self.best_loss = np.where(improved, monitored, self.best_loss)
+        self.best_epoch = np.where(improved, epoch, self.best_epoch)
+        self.wait = np.where(improved, 0, self.wait + 1)
+        self.lr_wait = np.where(improved, 0, self.lr_wait + 1)
+        if self.patience is not None and improved.any():
+            if self.best_weights is None or monitored.ndim == 0:
+                self.best_weights = get_weights()
+            else:
+                for best, current in zip(self.best_weights, get_weights()):
+                    best[improved] = current[improved]
+
+        if self.lr_schedule == 'plateau':
+            reduce = self.lr_wait >= self.lr_patience
+            self.learning_rate = np.where(reduce, np.maximum(self.learning_rate * self.lr_factor, self.min_lr), self.learning_rate)
+            self.lr_wait = np.where(reduce, 0, self.lr_wait)
+        elif self.lr_schedule == 'cosine':
+            progress = (epoch + 1) / self.epochs
+            self.learning_rate = self.min_lr + (self.initial_lr - self.min_lr) * 0.5 * (1 + np.cos(np.pi * progress))
+
+        if self.patience is not None:
+            self.active = self.active & (self.wait < self.patience)
+        stop = (not self.active.any()
+                or (self.time_budget is not None and time.perf_counter() - self.started >= self.time_budget))
+        if stop:
+            self.stopped_epoch = epoch
+        return stop, self.learning_rate
+
+    def summary(self):
+        """
+        Resumo do treinamento: épocas executadas, melhor época e perda (listas, para redes
+        empilhadas), taxa final e histórico das médias por época.
+        """
+        return {
+            'epochs_run': len(self.history['loss']),
+            'best_epoch': self.best_epoch.tolist(),
+            'best_loss': self.best_loss.tolist(),
+            'stopped_early': self.stopped_epoch is not None,
+            'history': self.history,
+        }
+
+def keras_callback(controller, validation_data=None):
+    """
+    Adapta um TrainingController para o fit do Keras (perda de treino lida de 'logs',
+    taxa de aprendizado aplicada ao otimizador e melhores pesos restaurados no fim).
+    A perda de validação é calculada com uma única chamada direta ao modelo, bem mais
+    barata que o 'validation_data' do fit, que monta uma avaliação completa a cada época.
+    """
+    from tensorflow.keras.callbacks import Callback
+
+    class ControllerCallback(Callback):
+        def on_train_begin(self, logs=None):
+            controller.start(float(self.model.optimizer.learning_rate), self.params['epochs'])
+
+        def on_epoch_end(self, epoch, logs=None):
+            val_loss = None
+            if validation_data is not None:
+                X_val, y_val = validation_data
+                val_loss = float(((np.asarray(self.model(X_val, training=False)) - y_val) ** 2).mean())
+            stop, learning_rate = controller.epoch_end(epoch, logs['loss'], val_loss, self.model.get_weights)
+            self.model.optimizer.learning_rate.assign(float(learning_rate))
+            if stop:
+                self.model.stop_training = True
+
+        def on_train_end(self, logs=None):
+            # Taxa original de volta no otimizador, para que um novo fit não parta da taxa reduzida
+            self.model.optimizer.learning_rate.assign(controller.initial_lr)
+            if controller.best_weights is not None:
+                self.model.set_weights(controller.best_weights)
+
+    return ControllerCallback()
+
+class NumpyMLP:
+    """
+    Rede neural densa (MLP) implementada em NumPy, com a mesma arquitetura e o mesmo
+    treinamento do modelo Keras: camadas ocultas ReLU, dropout após a primeira camada oculta,
+    saída linear, perda MSE e otimizador Adam. Expõe a mesma interface usada do Keras
+    (fit, predict, save_weights, load_weights).
+
+    Com 'n_models', treina várias redes independentes de uma só vez: os pesos ficam empilhados
+    em um eixo inicial de modelos e cada passo do treinamento é uma única operação em lote.
+
+    Parâmetros:
+        - n_features (int): Número de variáveis de entrada e de saída.
+        - hidden_layers (tuple): Neurônios de cada camada oculta.
+        - dropout (float): Taxa de dropout após a primeira camada oculta.
+        - learning_rate (float): Taxa de aprendizado do Adam.
+        - seed (int): Semente do gerador de números aleatórios (None = aleatória).
+        - n_models (int): Número de redes empilhadas (None = uma única rede, com entradas 2D).
+    """
+    weights_suffix = ".weights.npz"
+
+    def __init__(self, n_features, hidden_layers, dropout, learning_rate, seed=None, n_models=None):
+        self.dropout = dropout
+        self.learning_rate = learning_rate
+        self.n_models = n_models
+        self.rng = np.random.default_rng(seed)
+
+        sizes = [n_features, *hidden_layers, n_features]
+        self.params = []
+        for n_in, n_out in zip(sizes[:-1], sizes[1:]):
+            kernels = np.stack([glorot_uniform(self.rng, n_in, n_out) for _ in range(n_models or 1)])
+            self.params += [kernels, np.zeros((n_models or 1, 1, n_out))]
+
+    def stack(self, array):
+        """
+        Converte entradas para o formato (modelos, amostras, variáveis). Entradas 2D são
+        compartilhadas por todos os modelos empilhados.
+        """
+        array = np.asarray(array, dtype=float)
+        if array.ndim == 2:
+            array = np.broadcast_to(array, (len(self.params[0]), *array.shape))
+        return array
+
+    def forward(self, X, training=False):
+        """
+        Propaga 'X' (modelos, amostras, variáveis) pela rede e retorna a saída
+        e as ativações usadas no backpropagation.
+        """
+        activations = [X]
+        masks = []
+        output = X
+        n_layers = len(self.params) // 2
+        for layer in range(n_layers):
+            output = output @ self.params[2 * layer] + self.params[2 * layer + 1]
+            if layer < n_layers - 1:
+                output = np.maximum(output, 0.0)
+                # Dropout invertido apenas após a primeira camada oculta, como no modelo Keras
+                if layer == 0 and training and self.dropout > 0:
+                    mask = (self.rng.random(output.shape) >= self.dropout) / (1.0 - self.dropout)
+                    output = output * mask
+                    masks.append(mask)
+                else:
+                    masks.append(None)
+                activations.append(output)
+        return output, activations, masks
+
+    def gradients(self, X, y, weights):
+        """
+        Calcula o gradiente da perda MSE em relação a todos os pesos, para um batch.
+        'weights' (modelos, amostras) pondera cada amostra; a perda de cada modelo é a média
+        ponderada dos erros das suas amostras, de modo que os modelos não interferem entre si.
+        """
+        output, activations, masks = self.forward(X, training=True)
+        total = weights.sum(axis=1, keepdims=True) * y.shape[-1]
+        delta = 2.0 * (output - y) * (weights / np.maximum(total, 1e-12))[..., None]
+        grads = [None] * len(self.params)
+        for layer in reversed(range(len(self.params) // 2)):
+            grads[2 * layer] = activations[layer].transpose(0, 2, 1) @ delta
+            grads[2 * layer + 1] = delta.sum(axis=1, keepdims=True)
+            if layer > 0:
+                delta = delta @ self.params[2 * layer].transpose(0, 2, 1)
+                if masks[layer - 1] is not None:
+                    delta = delta * masks[layer - 1]
+                delta = delta * (activations[layer] > 0)
+        return grads
+
+    def loss(self, X, y, sample_weight=None):
+        """
+        Perda MSE (sem dropout), ponderada por 'sample_weight' (amostras,) ou (modelos, amostras)
+        como no treinamento: um valor por modelo para redes empilhadas, ou um float para uma rede única.
+        """
+        errors = ((self.forward(self.stack(X))[0] - self.stack(y)) ** 2).mean(axis=-1)
+        weights = np.ones(errors.shape[1]) if sample_weight is None else np.asarray(sample_weight, dtype=float)
+        weights = np.broadcast_to(weights, errors.shape)
+        losses = (errors * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-12)
+        return losses if self.n_models else float(losses[0])
+
+    def fit(self, X, y, epochs, batch_size, verbose=0, sample_weight=None, validation_data=None, controller=None):
+        """
+        Treina as redes com Adam em mini-batches embaralhados a cada época.
+
+        Parâmetros:
+            - X, y: Entradas e saídas, (amostras, variáveis) ou (modelos, amostras, variáveis).
+            - epochs (int): Número de épocas.
+            - batch_size (int): Tamanho do batch.
+            - sample_weight: Peso de cada amostra, (amostras,) ou (modelos, amostras);
+              peso zero exclui a amostra do treinamento daquele modelo (ex.: anos sem dados).
+            - validation_data (tuple): (X, y) de validação, avaliados ao fim de cada época.
+            - controller (TrainingController): Controle de parada antecipada, taxa de aprendizado
+              e tempo; os melhores pesos são restaurados no fim do treinamento. Redes empilhadas
+              são controladas uma a uma (perda ponderada de cada uma) e as que param deixam de ser atualizadas.
+        """
+        X, y = self.stack(X), self.stack(y)
+        n_samples = X.shape[1]
+        weights = np.ones(n_samples) if sample_weight is None else np.asarray(sample_weight, dtype=float)
+        weights = np.broadcast_to(weights, X.shape[:2])
+
+        moment_1 = [np.zeros_like(param) for param in self.params]
+        moment_2 = [np.zeros_like(param) for param in self.params]
+        step = 0
+        # A taxa ajustada pelo controle vale só para este treinamento; self.learning_rate não muda
+        learning_rate = self.learning_rate
+        active = 1.0
+        if controller is not None:
+            controller.start(learning_rate, epochs)
+        for epoch in range(epochs):
+            # Taxa e máscara de redes ativas com formato compatível com os pesos (modelos, ..., ...)
+            step_size = np.reshape(learning_rate, (-1, 1, 1)) * np.reshape(active, (-1, 1, 1))
+            order = self.rng.permutation(n_samples)
+            for start in range(0, n_samples, batch_size):
+                batch = order[start:start + batch_size]
+                step += 1
+                correction = np.sqrt(1 - ADAM_BETA_2 ** step) / (1 - ADAM_BETA_1 ** step)
+                grads = self.gradients(X[:, batch], y[:, batch], weights[:, batch])
+                for param, grad, m, v in zip(self.params, grads, moment_1, moment_2):
+                    m *= ADAM_BETA_1
+                    m += (1 - ADAM_BETA_1) * grad
+                    v *= ADAM_BETA_2
+                    v += (1 - ADAM_BETA_2) * grad ** 2
+                    param -= step_size * correction * m / (np.sqrt(v) + ADAM_EPSILON)
+            if controller is not None:
+                val_loss = None if validation_data is None else self.loss(*validation_data)
+                stop, learning_rate = controller.epoch_end(epoch, self.loss(X, y, weights), val_loss, self.get_weights)
+                active = controller.active
+                if stop:
+                    break
+
+        if controller is not None and controller.best_weights is not None:
+            self.set_weights(controller.best_weights)
+        return self
+
+    def get_weights(self):
+        return [param.copy() for param in self.params]
+
+    def set_weights(self, weights):
+        self.params = [np.array(weight) for weight in weights]
+
+    def predict(self, X, verbose=0):
+        """
+        Retorna as previsões, no mesmo formato das entradas de uma rede única
+        (amostras, variáveis) ou empilhadas (modelos, amostras, variáveis).
+        """
+        output = self.forward(self.stack(X))[0]
+        return output if self.n_models else output[0]
+
+    def save_weights(self, path):
+        np.savez(path, *self.params)
+
+    def load_weights(self, path):
+        with np.load(path) as weights:
+            self.params = [weights[f"arr_{i}"].reshape(param.shape) for i, param in enumerate(self.params)]
+
+class RidgeAR:
+    """
+    Modelo autorregressivo linear (ano t -> ano t+1) ajustado por regressão ridge em forma fechada.
+    Serve como linha de base para a rede neural e expõe a mesma interface (fit, predict, ...).
+
+    Parâmetros:
+        - n_features (int): Número de variáveis de entrada e de saída.
+        - alpha (float): Intensidade da regularização.
+    """
+    weights_suffix = ".weights.npz"
+
+    def __init__(self, n_features, alpha=RIDGE_ALPHA):
+        self.alpha = alpha
+        self.coef = np.zeros((n_features + 1, n_features))
+
+    def fit(self, X, y, epochs=None, batch_size=None, verbose=0):
+        """
+        Resolve (AᵀA + αI)W = Aᵀy, com A = [X, 1]; 'epochs' e 'batch_size' são ignorados.
+        """
+        A = np.hstack([X, np.ones((len(X), 1))])
+        penalty = self.alpha * np.eye(A.shape[1])
+        penalty[-1, -1] = 0.0
+        self.coef = np.linalg.solve(A.T @ A + penalty, A.T @ y)
+        return self
+
+    def predict(self, X, verbose=0):
+        X = np.asarray(X, dtype=float)
+        return X @ self.coef[:-1] + self.coef[-1]
+
+    def save_weights(self, path):
+        np.savez(path, self.coef)
+
+    def load_weights(self, path):
+        with np.load(path) as weights:
+            self.coef = weights["arr_0"]
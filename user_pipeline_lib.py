@@ -0,0 +1,215 @@
+# Módulos do Usuário
+import config
+from config import CACHE, CACHE_DIR
+from user_text_lib import secao, p
+from user_load_lib import file_hash
+from user_instrument_lib import measure_stage, count_rows
+
+# Importação de outros módulos necessários
+import os
+import sys
+import ast
+import json
+import time
+import types
+import pickle
+import hashlib
+import inspect
+import functools
+
+# Pasta onde os resultados das etapas do pipeline são gravados
+PIPELINE_DIR = os.path.join(CACHE_DIR, "pipeline")
+
+# Etapas registradas, na ordem em que foram declaradas
+STAGES = {}
+
+def stage(name, inputs=(), params=(), files=()):
+    """
+    Decorador que registra uma função como etapa do pipeline.
+
+    Parâmetros:
+        - name (str): Nome da etapa.
+        - inputs (tuple): Nomes das etapas cujos resultados a função recebe, na mesma ordem.
+        - params (tuple): Nomes das configurações de config.py que afetam o resultado.
+        - files (tuple): Arquivos lidos pela etapa; o conteúdo entra na identificação do resultado.
+    """
+    def register(function):
+        STAGES[name] = {'function': function, 'inputs': tuple(inputs), 'params': tuple(params), 'files': tuple(files)}
+        return function
+    return register
+
+def referenced_names(code):
+    """
+    Retorna os nomes globais usados por um objeto de código, incluindo funções internas.
+    """
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names |= referenced_names(constant)
+    return names
+
+def module_imports(path):
+    """
+    Lê um módulo e retorna os módulos que ele importa (em qualquer ponto, inclusive as importações
+    feitas dentro de funções) e os nomes que ele importa de config.
+    """
+    return parse_imports(path, os.stat(path).st_mtime_ns)
+
+@functools.lru_cache(maxsize=None)
+def parse_imports(path, mtime):
+    # Resultado guardado por versão do arquivo (data de modificação), para não reler a cada etapa e gráfico
+    with open(path, encoding='utf-8') as file:
+        tree = ast.parse(file.read())
+    modules, settings = set(), set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules |= {alias.name for alias in node.names}
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.add(node.module)
+            if node.module == 'config':
+                settings |= {alias.name for alias in node.names}
+    return modules, settings
+
+def code_fingerprint(function):
+    """
+    Identifica o código de uma etapa: o fonte da função, o conteúdo de todos os módulos do projeto
+    que ela alcança, direta ou indiretamente (ex.: alterar user_model_lib.py, usado via user_data_lib,
+    invalida a etapa de previsão), e os valores das configurações que esses módulos leem de config.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(inspect.getsource(function).encode())
+    main_module = sys.modules.get(function.__module__)
+
+    # Configurações usadas diretamente pela função e módulos do projeto referenciados por ela
+    settings = {}
+    pending = []
+    for name in referenced_names(function.__code__):
+        if name in function.__globals__ and hasattr(config, name):
+            settings[name] = function.__globals__[name]
+        module = inspect.getmodule(function.__globals__.get(name))
+        path = getattr(module, '__file__', None)
+        if path and os.path.dirname(os.path.abspath(path)) == root and module is not main_module:
+            pending.append(os.path.abspath(path))
+
+    # Fechamento transitivo das importações; config.py entra pelos valores lidos, não pelo arquivo,
+    # para que alterar uma configuração invalide apenas as etapas que a usam
+    modules = set()
+    while pending:
+        path = pending.pop()
+        if path in modules or os.path.basename(path) == 'config.py':
+            continue
+        modules.add(path)
+        imported, names = module_imports(path)
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        for name in names:
+            # Valor em uso no módulo (pode ter sido alterado em tempo de execução, ex.: DEBUG_LEVEL)
+            settings[f"{module_name}.{name}"] = getattr(sys.modules.get(module_name), name, getattr(config, name, None))
+        for imported_name in imported:
+            candidate = os.path.join(root, imported_name + '.py')
+            if os.path.exists(candidate):
+                pending.append(candidate)
+
+    for path in sorted(modules):
+        digest.update(file_hash(path).encode())
+    digest.update(repr(sorted(settings.items())).encode())
+    return digest.hexdigest()
+
+def stage_fingerprint(name, upstream):
+    """
+    Calcula a identificação de uma etapa a partir do seu código, das configurações e arquivos
+    declarados e das identificações das etapas de entrada.
+
+    Parâmetros:
+        - name (str): Nome da etapa.
+        - upstream (dict): Identificações já calculadas das etapas de entrada.
+    """
+    definition = STAGES[name]
+    description = {
+        'code': code_fingerprint(definition['function']),
+        'params': {param: getattr(config, param) for param in definition['params']},
+        'files': {path: file_hash(path) for path in definition['files']},
+        'inputs': [upstream[dependency] for dependency in definition['inputs']],
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+
+def stage_paths(name):
+    base = os.path.join(PIPELINE_DIR, name)
+    return base + ".pkl", base + ".json"
+
+def is_fresh(name, fingerprint):
+    """
+    Verifica se o resultado gravado da etapa foi produzido com a mesma identificação.
+    """
+    output_path, manifest_path = stage_paths(name)
+    if not (CACHE and os.path.exists(output_path) and os.path.exists(manifest_path)):
+        return False
+    with open(manifest_path) as file:
+        return json.load(file).get('fingerprint') == fingerprint
+
+def save_output(name, fingerprint, output):
+    if CACHE:
+        os.makedirs(PIPELINE_DIR, exist_ok=True)
+        output_path, manifest_path = stage_paths(name)
+        with open(output_path, 'wb') as file:
+            pickle.dump(output, file)
+        with open(manifest_path, 'w') as file:
+            json.dump({'fingerprint': fingerprint}, file)
+
+def load_output(name):
+    with open(stage_paths(name)[0], 'rb') as file:
+        return pickle.load(file)
+
+def resolve(targets):
+    """
+    Retorna as etapas necessárias para 'targets' (incluindo as dependências), em ordem de execução.
+    """
+    order = []
+    def visit(name):
+        if name not in STAGES:
+            raise ValueError(f"Etapa desconhecida: {name}. Etapas disponíveis: {', '.join(STAGES)}")
+        if name in order:
+            return
+        for dependency in STAGES[name]['inputs']:
+            visit(dependency)
+        order.append(name)
+    for name in targets:
+        visit(name)
+    return order
+
+def run_pipeline(targets=None, force=False):
+    """
+    Executa as etapas pedidas (e suas dependências), reaproveitando o resultado gravado
+    de toda etapa cujo código, configurações, arquivos e entradas não mudaram.
+
+    Parâmetros:
+        - targets (list): Etapas a executar (None = todas).
+        - force (bool): Reexecutar as etapas pedidas mesmo sem alterações.
+
+    Retorna:
+        - dict com o resultado de cada etapa pedida.
+    """
+    targets = list(targets or STAGES)
+    fingerprints = {}
+    outputs = {}
+
+    def output_of(name):
+        if name not in outputs:
+            outputs[name] = load_output(name)
+        return outputs[name]
+
+    for name in resolve(targets):
+        fingerprints[name] = stage_fingerprint(name, fingerprints)
+        if is_fresh(name, fingerprints[name]) and not (force and name in targets):
+            secao(f"Etapa '{name}': sem alterações, resultado reaproveitado")
+            continue
+
+        definition = STAGES[name]
+        inputs = [output_of(dependency) for dependency in definition['inputs']]
+        start = time.perf_counter()
+        with measure_stage(name, count_rows(*inputs)) as record:
+            outputs[name] = definition['function'](*inputs)
+            record['rows_out'] = count_rows(outputs[name])
+        save_output(name, fingerprints[name], outputs[name])
+        p(f"Etapa '{name}' executada em {time.perf_counter() - start:.2f}s")
+
+    return {name: output_of(name) for name in targets}
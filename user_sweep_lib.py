@@ -0,0 +1,80 @@
+# Módulos do Usuário
+from config import MODEL_BACKEND
+import user_text_lib
+from user_text_lib import secao, p
+from user_data_lib import train_and_predict
+from user_instrument_lib import peak_rss_mb
+
+# Importação de outros módulos necessários
+import os
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+
+def init_sweep_worker():
+    """
+    Prepara cada processo da varredura: sem saídas de depuração e com o TensorFlow
+    limitado a uma thread, para que os processos paralelos não disputem os mesmos núcleos.
+    """
+    user_text_lib.DEBUG_LEVEL = 0
+
+    if MODEL_BACKEND != 'keras':
+        return
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+def train_configuration(combined_data, split_year, epocas, batch_size):
+    """
+    Treina e avalia uma configuração de hiperparâmetros (executado em um processo da varredura).
+
+    Retorna:
+        - dict com a configuração, o MSE de teste, os tempos de treinamento e do conjunto e o pico de memória.
+    """
+    # Os processos da varredura não registram o ponto de partida do retreino incremental (remember_model)
+    result = train_and_predict(combined_data.copy(), split_year, epocas, batch_size, remember=False)
+    return {
+        'split_year': split_year,
+        'epochs': epocas,
+        'batch_size': batch_size,
+        'test_mse': result['test_mse'],
+        'train_time': result['train_time'],
+        'ensemble_time': result['ensemble_time'],
+        'peak_memory_mb': peak_rss_mb(),
+        'cached': result['cached'],
+    }
+
+def run_sweep(combined_data, split_years, epochs, batch_sizes, workers=None):
+    """
+    Treina a rede neural para todas as combinações de 'split_years', 'epochs' e 'batch_sizes',
+    em paralelo, uma configuração por processo.
+
+    Parâmetros:
+        - combined_data (DataFrame): Dados combinados (preparados uma única vez).
+        - split_years (list): Anos de divisão entre treino e teste.
+        - epochs (list): Números de épocas.
+        - batch_sizes (list): Tamanhos de batch.
+        - workers (int): Número de processos (None = número de CPUs).
+
+    Retorna:
+        - DataFrame com uma linha por configuração, ordenado pelo menor MSE de teste.
+    """
+    grid = list(itertools.product(split_years, epochs, batch_sizes))
+    workers = min(workers or os.cpu_count() or 1, len(grid))
+    secao(f"VARREDURA DE HIPERPARÂMETROS -- {len(grid)} configurações | {workers} processos")
+
+    # Cada configuração roda em um processo novo ('spawn' e max_tasks_per_child=1),
+    # para que o pico de memória medido seja apenas o dela
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_sweep_worker,
+                             max_tasks_per_child=1) as executor:
+        futures = [executor.submit(train_configuration, combined_data, *configuration) for configuration in grid]
+        for future in as_completed(futures):
+            results.append(future.result())
+            row = results[-1]
+            p(f"split_year {row['split_year']} | épocas {row['epochs']} | batch {row['batch_size']}: "
+              f"MSE {row['test_mse']:.5f} em {row['train_time']:.1f}s (+{row['ensemble_time']:.1f}s do conjunto)")
+
+    return pd.DataFrame(results).sort_values(by='test_mse').reset_index(drop=True)
@@ -0,0 +1,140 @@
+# Importação de outros módulos necessários
+import re
+import numpy as np
+import pandas as pd
+
+# Marcadores usados pelo IBGE e pelo Data.Rio no lugar de números: "-" = zero absoluto (vira 0.0);
+# "..." / ".." = dado não disponível e "X" = dado omitido (viram NaN)
+ZERO_MARKERS = ('-',)
+MISSING_MARKERS = ('--', '...', '..', 'X', 'x')
+
+def parse_numbers(values, thousands=',', decimal='.'):
+    """
+    Converte textos numéricos formatados (ex.: " 4,251,918 " ou "1.234,5") para float, sem regex por célula:
+    as células que já são números válidos são convertidas diretamente e só as demais passam
+    pela limpeza vetorizada (espaços, separador de milhar e separador decimal). Quando o separador
+    de milhar é ".", todos os textos passam pela limpeza ("1.234" é 1234, e não 1,234).
+
+    Parâmetros:
+        - values (Series): Valores a converter (textos ou números).
+        - thousands (str): Separador de milhar.
+        - decimal (str): Separador decimal.
+
+    Retorna:
+        - Series de float64, com 0.0 nos marcadores de zero absoluto e NaN nas células vazias,
+          marcadores de dado ausente e textos não numéricos.
+    """
+    if thousands == '.' and not pd.api.types.is_numeric_dtype(values):
+        numbers = pd.Series(np.nan, index=values.index)
+    else:
+        numbers = pd.to_numeric(values, errors='coerce').astype('float64')
+    pending = numbers.isna() & values.notna()
+    if pending.any():
+        text = values[pending].astype(str).str.strip()
+        text = text.mask(text.isin(ZERO_MARKERS), '0').where(~text.isin(MISSING_MARKERS))
+        if thousands:
+            text = text.str.replace(thousands, '', regex=False)
+        if decimal != '.':
+            text = text.str.replace(decimal, '.', regex=False)
+        numbers[pending] = pd.to_numeric(text, errors='coerce')
+    return numbers
+
+def read_table(path, delimiter=',', thousands=',', decimal='.', text_columns=()):
+    """
+    Lê uma tabela com números formatados. O caminho rápido é o próprio leitor em C do pandas
+    (separador de milhar, decimal e espaços iniciais); as colunas que ainda ficarem como texto
+    (ex.: por marcadores como "...") são convertidas por parse_numbers.
+
+    Parâmetros:
+        - path (str): Caminho do arquivo CSV.
+        - delimiter (str): Separador de colunas.
+        - thousands (str): Separador de milhar.
+        - decimal (str): Separador decimal.
+        - text_columns (tuple): Colunas mantidas como texto (identificadores, ex.: 'Nível').
+
+    Retorna:
+        - DataFrame com as colunas numéricas em float64 (ou int, quando o leitor já as tipou assim).
+    """
+    data = pd.read_csv(path, delimiter=delimiter, thousands=thousands, decimal=decimal, skipinitialspace=True,
+                       dtype={column: str for column in text_columns})
+    for column in data.columns.difference(list(text_columns)):
+        # Colunas de texto de verdade (ex.: 'Indicador', 'Unidade', sem nenhum dígito) não são convertidas
+        if pd.api.types.is_numeric_dtype(data[column]) or not data[column].str.contains(r'\d').any():
+            continue
+        numbers = parse_numbers(data[column], thousands, decimal)
+        if numbers.notna().any():
+            data[column] = numbers
+    return data
+
+def wide_to_long(data, id_columns, var_name='Ano', value_name='valor'):
+    """
+    Converte uma tabela larga, com uma coluna por ano (ex.: "1999", "2000", ...), para o formato longo
+    em uma única passada: a matriz séries x anos é achatada de uma vez e os identificadores e anos
+    são repetidos ao lado (sem o trabalho coluna a coluna do melt).
+
+    Parâmetros:
+        - data (DataFrame): Tabela larga.
+        - id_columns (list): Colunas que identificam cada série (ex.: ['Nível']).
+        - var_name (str): Nome da coluna dos anos.
+        - value_name (str): Nome da coluna dos valores.
+
+    Retorna:
+        - DataFrame com as colunas id_columns, var_name e value_name, uma linha por série e ano.
+    """
+    year_columns = [column for column in data.columns if re.fullmatch(r'\d{4}', str(column))]
+    years = np.array(year_columns, dtype=int)
+    long = {column: np.repeat(data[column].to_numpy(), len(years)) for column in id_columns}
+    long[var_name] = np.tile(years, len(data))
+    long[value_name] = data[year_columns].to_numpy(dtype='float64').ravel()
+    return pd.DataFrame(long)
+
+def read_wide_table(path, id_columns, series=None, delimiter=';', thousands=None, decimal='.',
+                    var_name='Ano', value_name='valor'):
+    """
+    Lê uma tabela larga de indicadores (IBGE / Data.Rio: uma linha por série, uma coluna por ano)
+    e retorna as séries escolhidas no formato ano x série.
+
+    Parâmetros:
+        - path (str): Caminho do arquivo CSV.
+        - id_columns (list): Colunas que identificam cada série; a primeira é a chave das séries
+          (se a chave se repetir, vale a primeira linha, como no antigo isin/iloc[0]).
+        - series (dict): Chave da série -> nome da coluna no resultado (None = todas, com a própria chave).
+        - delimiter, thousands, decimal (str): Formato do arquivo (ver read_table).
+        - var_name, value_name (str): Nomes das colunas no formato longo intermediário.
+
+    Retorna:
+        - DataFrame indexado pelo ano, com uma coluna por série, na ordem de 'series'.
+    """
+    key = id_columns[0]
+    data = read_table(path, delimiter, thousands, decimal, text_columns=id_columns)
+    if series is not None:
+        data = data[data[key].isin(list(series))]
+    # Chave repetida (ex.: a mesma série em dois blocos do arquivo): vale a primeira linha
+    data = data.drop_duplicates(subset=key, keep='first')
+    long = wide_to_long(data, id_columns, var_name, value_name)
+
+    table = long.set_index([var_name, key])[value_name].unstack(key)
+    table = table.reindex(columns=list(series) if series is not None else table.columns)
+    table = table.rename(columns=series or {}).astype('float64')
+    table.index.name, table.columns.name = None, None
+    return table
+
+def coalesce(data, priority):
+    """
+    Combina séries em ordem de prioridade: em cada linha, o valor da primeira série (na ordem de
+    'priority') que não é NaN. Generaliza "1.1 tem prioridade sobre 1.2, que tem prioridade sobre 1.3"
+    para qualquer número de séries, em uma única operação vetorizada.
+
+    Parâmetros:
+        - data (DataFrame): Tabela com as séries em colunas.
+        - priority (list): Colunas em ordem decrescente de prioridade.
+
+    Retorna:
+        - Series com o valor combinado de cada linha (NaN se nenhuma série tiver valor).
+    """
+    values = data[list(priority)].to_numpy(dtype='float64')
+    valid = ~np.isnan(values)
+    first = valid.argmax(axis=1)
+    combined = values[np.arange(len(values)), first]
+    combined[~valid.any(axis=1)] = np.nan
+    return pd.Series(combined, index=data.index)
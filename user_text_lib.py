@@ -1,43 +1,97 @@
 # Módulos do Usuário
-from config import DEBUG_LEVEL
+from config import DEBUG_LEVEL, MAX_ROWS, LOG_FILE
+from user_instrument_lib import instrument_module
 
 # Importação de outros módulos necessários
+import io
 import pandas as pd
 
-def secao(texto):
+# Arquivo de saída aberto (quando LOG_FILE está definido)
+log_file = None
+
+def write(texto):
     """
-    Exibe uma seção formatada com o texto informado, delimitada por linhas, se o DEBUG_LEVEL for 1 ou superior.
-    
+    Grava uma linha de texto na saída de depuração: o arquivo LOG_FILE, se definido, ou a tela.
+
     Parâmetros:
-        - texto (str): Texto da seção a ser exibido.
+        - texto (str): Texto a ser gravado.
     """
-    if DEBUG_LEVEL >= 1:
-        print("\n" + "-" * len(texto))
+    global log_file
+    if LOG_FILE is None:
         print(texto)
-        print("-" * len(texto))
+        return
+    if log_file is None:
+        log_file = open(LOG_FILE, 'a', encoding='utf-8')
+    log_file.write(f"{texto}\n")
+    log_file.flush()
 
-def p(texto):
+def render(texto):
     """
-    Exibe o texto informado, apenas se o DEBUG_LEVEL for 2 ou superior.
+    Converte o conteúdo a exibir em texto. Funções (ex.: lambda) são chamadas apenas aqui,
+    e DataFrames/Series são limitados a MAX_ROWS linhas.
 
     Parâmetros:
-        - texto (str): Texto a ser exibido.
+        - texto: Texto, objeto qualquer ou função sem parâmetros que retorna o conteúdo.
     """
-    if DEBUG_LEVEL >= 2:
-        print("")
-        print(texto)
+    if callable(texto):
+        texto = texto()
+    if isinstance(texto, (pd.DataFrame, pd.Series)):
+        with pd.option_context('display.max_rows', MAX_ROWS, 'display.min_rows', MAX_ROWS, 'display.max_columns', None):
+            return str(texto)
+    return str(texto)
+
+def secao(texto, level=1):
+    """
+    Exibe uma seção formatada com o texto informado, delimitada por linhas, se o DEBUG_LEVEL for 'level' (padrão 1) ou superior.
+    
+    Parâmetros:
+        - texto (str ou função): Texto da seção a ser exibido, ou função que o retorna.
+        - level (int): Nível mínimo de DEBUG_LEVEL para exibir a seção.
+    """
+    if DEBUG_LEVEL >= level:
+        texto = render(texto)
+        write("\n" + "-" * len(texto))
+        write(texto)
+        write("-" * len(texto))
+
+def p(texto, level=2):
+    """
+    Exibe o texto informado, apenas se o DEBUG_LEVEL for 'level' (padrão 2) ou superior.
+    O conteúdo só é formatado (ou calculado, se for uma função) quando vai ser exibido.
+
+    Parâmetros:
+        - texto: Texto ou objeto a ser exibido, ou função sem parâmetros que o retorna
+          (ex.: p(lambda: data.describe()) não calcula nada quando o nível não é atingido).
+        - level (int): Nível mínimo de DEBUG_LEVEL para exibir o texto.
+    """
+    if DEBUG_LEVEL >= level:
+        write("")
+        write(render(texto))
+
+def info(data):
+    """
+    Retorna o texto de DataFrame.info(), que normalmente é impresso direto na tela.
+    """
+    buffer = io.StringIO()
+    data.info(buf=buffer)
+    return buffer.getvalue().rstrip('\n')
 
 def list_station(metro_data, station):
     """
     Exibe todos os registros da estação especificada, incluindo as colunas 'year_month' e 'passengers'.
 
     Parâmetros:
-        - metro_data (DataFrame): DataFrame com os dados do metrô.
+        - metro_data (DataFrame ou MetroMatrix): Dados do metrô; com a MetroMatrix a consulta
+          é uma fatia da linha da estação, sem percorrer todos os registros.
         - station (str): Nome da estação a ser listada.
     """
-    pd.set_option('display.max_rows', None)  # Configurar para exibir todas as linhas
     secao("Dados da estação " + station)
     
-    # Filtrar dados da estação e exibir apenas as colunas relevantes
-    station_data = metro_data[metro_data['Station'] == station][['year_month', 'passengers']]
-    p(station_data)
+    # Filtrar dados da estação e exibir apenas as colunas relevantes (somente se for exibido)
+    if isinstance(metro_data, pd.DataFrame):
+        p(lambda: metro_data.loc[metro_data['Station'] == station, ['year_month', 'passengers']])
+    else:
+        p(lambda: metro_data.station(station))
+
+# Instrumentação das funções públicas (somente quando INSTRUMENT estiver habilitado)
+instrument_module(globals())